@@ -0,0 +1,171 @@
+from __future__ import annotations  # needed for type annotations in > python 3.7
+
+import argparse
+import json
+import logging
+import os
+import subprocess
+import time
+from typing import Dict, List, Optional
+
+
+def count_events(filenames: List[str], tree: str) -> Optional[int]:
+    try:
+        import ROOT
+    except ImportError:
+        logging.warning("ROOT is not available, events/s can not be calculated")
+        return None
+    chain = ROOT.TChain(tree)
+    for filename in filenames:
+        chain.Add(filename)
+    return chain.GetEntries()
+
+
+def run_executable(
+    executable: str, output: str, inputs: List[str], threads: int
+) -> Dict[str, float]:
+    """
+    Run the executable pinned to the first n cores and measure wall time, cpu time
+    and peak memory of the process. The number of threads of a generated executable
+    is fixed at generation time, so the executable has to be generated with the
+    same number of threads it is pinned to.
+    """
+    cores = ",".join(str(core) for core in sorted(os.sched_getaffinity(0))[:threads])
+    command = ["taskset", "-c", cores, executable, output] + inputs
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    # wait4 instead of wait, to get the resource usage of this process only
+    _, status, usage = os.wait4(process.pid, 0)
+    wall = time.perf_counter() - start
+    process.returncode = os.waitstatus_to_exitcode(status)
+    if process.returncode != 0:
+        raise RuntimeError(
+            f"{' '.join(command)} failed with exit code {process.returncode}"
+        )
+    cpu = usage.ru_utime + usage.ru_stime
+    return {
+        "threads": threads,
+        "wall_s": wall,
+        "cpu_s": cpu,
+        "cpu_efficiency": cpu / (wall * threads),
+        # ru_maxrss is given in kB on linux
+        "peak_rss_mb": usage.ru_maxrss / 1024,
+    }
+
+
+def thread_executable(executable: str, threads: int) -> str:
+    """
+    Return the executable generated for the given number of threads, the executable
+    name contains a {threads} placeholder, e.g. build_t{threads}/config_dyjets_2018.
+    """
+    return os.path.abspath(executable.format(threads=threads))
+
+
+def sweep(
+    executable: str,
+    inputs: List[str],
+    threads: List[int],
+    workdir: str,
+    n_events: Optional[int],
+    repetitions: int,
+) -> List[Dict[str, float]]:
+    results = []
+    for n_threads in threads:
+        runs = []
+        for repetition in range(repetitions):
+            output = os.path.join(workdir, f"benchmark_{n_threads}_{repetition}.root")
+            runs.append(
+                run_executable(
+                    thread_executable(executable, n_threads), output, inputs, n_threads
+                )
+            )
+        # keep the fastest repetition, the others are disturbed by the system
+        result = min(runs, key=lambda run: run["wall_s"])
+        if n_events is not None:
+            result["events_per_s"] = n_events / result["wall_s"]
+        results.append(result)
+        name = os.path.basename(thread_executable(executable, n_threads))
+        logging.info(f"{name}: {result}")
+    return results
+
+
+def print_table(executable: str, results: List[Dict[str, float]]) -> None:
+    print(f"\n{executable}")
+    print(
+        f"{'threads':>8} {'wall [s]':>10} {'events/s':>10} {'speedup':>8} {'cpu eff.':>9} {'RSS [MB]':>9}"
+    )
+    reference = results[0]["wall_s"] * results[0]["threads"]
+    for result in results:
+        events_per_s = result.get("events_per_s")
+        print(
+            f"{result['threads']:>8} {result['wall_s']:>10.1f} "
+            f"{events_per_s if events_per_s is not None else float('nan'):>10.1f} "
+            f"{reference / result['wall_s']:>8.2f} {result['cpu_efficiency']:>9.2f} "
+            f"{result['peak_rss_mb']:>9.0f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure the thread scaling of generated executables."
+    )
+    parser.add_argument(
+        "--executable",
+        nargs="+",
+        required=True,
+        help="generated executables, e.g. one per scope and shift configuration, "
+        "with a {threads} placeholder for the thread count the executable was "
+        "generated with (generate.py --threads), e.g. build_t{threads}/config_dyjets_2018",
+    )
+    parser.add_argument("--input", nargs="+", required=True, help="input nanoAOD files")
+    parser.add_argument(
+        "--threads", nargs="+", type=int, default=[1, 2, 4, 8, 16, 32, 64]
+    )
+    parser.add_argument("--repetitions", type=int, default=1)
+    parser.add_argument("--workdir", default="benchmark_output")
+    parser.add_argument("--tree", default="Events")
+    parser.add_argument("--output", help="json file to store the results")
+    args = parser.parse_args()
+    logging.basicConfig(level="INFO")
+    for executable in args.executable:
+        if "{threads}" not in executable:
+            parser.error(
+                f"{executable} has no {{threads}} placeholder, the thread count of an "
+                "executable is fixed at generation time"
+            )
+
+    available_cores = len(os.sched_getaffinity(0))
+    threads = sorted(n for n in args.threads if n <= available_cores)
+    if len(threads) < len(args.threads):
+        logging.warning(f"Only {available_cores} cores available, sweeping {threads}")
+    if not os.path.exists(args.workdir):
+        os.makedirs(args.workdir)
+    n_events = count_events(args.input, args.tree)
+
+    results = {}
+    for executable in args.executable:
+        missing = [
+            n for n in threads if not os.path.exists(thread_executable(executable, n))
+        ]
+        if missing:
+            raise FileNotFoundError(
+                f"{executable} is not generated for {missing} threads"
+            )
+        results[executable] = sweep(
+            executable,
+            args.input,
+            threads,
+            args.workdir,
+            n_events,
+            args.repetitions,
+        )
+        print_table(executable, results[executable])
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=4)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+from __future__ import annotations  # needed for type annotations in > python 3.7
+
+import hashlib
+import logging
+import os
+from typing import Dict, Tuple
+
+
+def file_hash(filename: str) -> str:
+    sha = hashlib.sha256()
+    with open(filename, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            sha.update(block)
+    return sha.hexdigest()
+
+
+def snapshot_sources(folder: str) -> Dict[str, Tuple[str, int]]:
+    """Record content hash and modification time of all files below folder."""
+    snapshot = {}
+    if not os.path.isdir(folder):
+        return snapshot
+    for dirpath, _, filenames in os.walk(folder):
+        for filename in filenames:
+            filepath = os.path.join(dirpath, filename)
+            snapshot[filepath] = (file_hash(filepath), os.stat(filepath).st_mtime_ns)
+    return snapshot
+
+
+def restore_unchanged_mtimes(folder: str, snapshot: Dict[str, Tuple[str, int]]) -> int:
+    """
+    Reset the modification time of all regenerated files below folder whose content
+    did not change to the time recorded in the snapshot. The code generation rewrites
+    every source file, so without this the build system would recompile all of them.
+    Returns the number of unchanged files.
+    """
+    unchanged = 0
+    for filepath, (sha, mtime) in snapshot.items():
+        if not os.path.isfile(filepath) or file_hash(filepath) != sha:
+            continue
+        os.utime(filepath, ns=(mtime, mtime))
+        unchanged += 1
+    logging.getLogger().info(
+        f"{unchanged} of {len(snapshot)} previously generated files in {folder} are unchanged"
+    )
+    return unchanged
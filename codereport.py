@@ -0,0 +1,79 @@
+from __future__ import annotations  # needed for type annotations in > python 3.7
+
+import logging
+import os
+from typing import Dict, Optional
+
+from .dependency_graph import analysis_scopes, producer_runs, shift_name
+
+
+def output_columns(configuration) -> Dict[str, Dict[str, int]]:
+    """Count the output columns per scope and shift, the nominal included."""
+    columns: Dict[str, Dict[str, int]] = {}
+    for scope in analysis_scopes(configuration):
+        scope_columns = columns.setdefault(scope, {"nominal": 0})
+        for output in configuration.outputs.get(scope, []):
+            scope_columns["nominal"] += 1
+            for shift in output.get_shifts(scope):
+                name = shift_name(shift)
+                scope_columns[name] = scope_columns.get(name, 0) + 1
+    return columns
+
+
+def source_sizes(configuration, folder: str) -> Dict[str, int]:
+    """
+    Sum up the size of the generated sources per scope. Files are attributed to a
+    scope if the scope appears in their path, all others are counted as "common".
+    """
+    scopes = analysis_scopes(configuration)
+    sizes = {scope: 0 for scope in scopes}
+    sizes["common"] = 0
+    for dirpath, _, filenames in os.walk(folder):
+        for filename in filenames:
+            filepath = os.path.join(dirpath, filename)
+            parts = os.path.relpath(filepath, folder).replace(".", os.sep).split(os.sep)
+            scope = next((scope for scope in scopes if scope in parts), "common")
+            sizes[scope] += os.path.getsize(filepath)
+    return sizes
+
+
+def code_report(configuration, folder: str) -> Dict:
+    calls = producer_runs(configuration)
+    return {
+        "calls": calls,
+        "columns": output_columns(configuration),
+        "source_bytes": source_sizes(configuration, folder),
+        "total_calls": sum(sum(runs.values()) for runs in calls.values()),
+    }
+
+
+def log_code_report(report: Dict) -> None:
+    root = logging.getLogger()
+    for scope, runs in report["calls"].items():
+        columns = report["columns"].get(scope, {})
+        root.info(
+            f"Scope {scope}: {report['source_bytes'].get(scope, 0) / 1024:.1f} kB of generated code"
+        )
+        for shift, n_calls in runs.items():
+            root.info(
+                f"    {shift}: {n_calls} producer calls, {columns.get(shift, 0)} output columns"
+            )
+    root.info(
+        f"Total: {report['total_calls']} producer calls, "
+        f"{sum(report['source_bytes'].values()) / 1024:.1f} kB of generated code"
+    )
+
+
+def check_code_budget(
+    report: Dict, call_budget: Optional[int], source_budget: Optional[int]
+) -> None:
+    """Raise if the generated code exceeds the budget of producer calls or source bytes."""
+    if call_budget is not None and report["total_calls"] > call_budget:
+        raise ValueError(
+            f"Generated code has {report['total_calls']} producer calls, the budget is {call_budget}"
+        )
+    source_bytes = sum(report["source_bytes"].values())
+    if source_budget is not None and source_bytes > source_budget:
+        raise ValueError(
+            f"Generated code has {source_bytes} bytes, the budget is {source_budget}"
+        )
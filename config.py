@@ -17,11 +17,12 @@ from .quantities import output as q
 from .triggersetup import add_earlyRun3TriggerSetup
 from .jet_variations import add_jetVariations
 from .jec_data import add_jetCorrectionData
-from code_generation.configuration import Configuration
 from code_generation.modifiers import EraModifier, SampleModifier
 from code_generation.rules import AppendProducer, RemoveProducer, ReplaceProducer
 from code_generation.systematics import SystematicShift, SystematicShiftByQuantity
 from .variations import add_leptonSFShifts  # add_tauVariations
+from .dependency_graph import check_leading_entries, validate_configuration
+from .parameters import ResolvedConfiguration
 
 # from .producers import taus as taus
 # from .producers import embedding as emb
@@ -36,7 +37,8 @@ def build_config(
     available_eras: List[str],
     available_scopes: List[str],
 ):
-    configuration = Configuration(
+    # era and sample modifiers are resolved once when the parameters are added
+    configuration = ResolvedConfiguration(
         era,
         sample,
         scopes,
@@ -84,6 +86,13 @@ def build_config(
                     ],
                 }
             ),
+            # file level metadata (sample flags, sum of weights, cutflow) of the
+            # executable, written to its working directory
+            "metadata_file": "metadata.json",
+            # events seen and passed by the filters are counted in the main event
+            # loop and stored per scope and shift in the metadata record
+            "cutflow_scope": "global",
+            "cutflow_weight": SampleModifier({"data": ""}, default="genweight"),
         },
     )
 
@@ -353,17 +362,20 @@ def build_config(
         "global",
         [
             # event.RunLumiEventFilter,
-            event.SampleFlags,
+            event.MetadataRecord,
+            # the sample flags are constant per executable, producers use the {is_<sample>}
+            # parameters directly and the flags are stored as file level metadata
+            event.SampleFlagsMetadata,
             event.Lumi,
             event.npartons,
+            event.EventGenWeight,
+            # the sum of weights is accumulated before any filter and stored in the metadata record
+            event.SumOfWeights,
             event.MetFilter,
             event.PUweights,
-            event.EventGenWeight,
             muons.BaseMuons,
             electrons.BaseElectrons,
             jets.JetEnergyCorrection,
-            jets.GoodJets,
-            jets.GoodBJets,
             met.MetBasics,
 
             # event.DiLeptonVeto,
@@ -381,9 +393,8 @@ def build_config(
     configuration.add_producers(
         scopes,
         [
-            jets.JetCollection,
+            jets.GoodJetCollections,
             jets.BasicJetQuantities,
-            jets.BJetCollection,
             jets.BasicBJetQuantities,
             met.MetCorrections,
             met.PFMetCorrections,
@@ -401,16 +412,16 @@ def build_config(
             pairselection.LVMu2,
             pairselection.LVMu1Uncorrected,
             pairselection.LVMu2Uncorrected,
-            pairquantities.DileptonQuantities,
-            pairquantities.DileptonMETQuantities,
+            pairquantities.DileptonKinematicQuantities,
 
             scalefactors.MuonIDIso_SF,
+            triggers.TriggerDecisions,
+            triggers.MMTriggerSelections1,
+            triggers.MMTriggerSelections2,
             triggers.MMGenerateSingleMuonTriggerFlags1,
             triggers.MMGenerateSingleMuonTriggerFlags2,
 
-            genparticles.MMGenDiTauPairQuantities,
-            genparticles.gen_match_1,
-            genparticles.gen_match_2,
+            genparticles.MMGenDileptonQuantities,
         ],
     )
 
@@ -422,9 +433,11 @@ def build_config(
             muons.OneGoodMuonSelection,
             pairselection.LVMu1,
             pairselection.LVMu1Uncorrected,
-            pairquantities.LepMETQuantities,
+            pairquantities.LepMETKinematicQuantities,
 
             scalefactors.MuonIDIso_SF,
+            triggers.TriggerDecisions,
+            triggers.MMTriggerSelections1,
             triggers.MMGenerateSingleMuonTriggerFlags1,
 
             genparticles.gen_match_1,
@@ -443,10 +456,12 @@ def build_config(
             pairselection.LVEl2,
             pairselection.LVEl1Uncorrected,
             pairselection.LVEl2Uncorrected,
-            pairquantities.DileptonQuantities,
-            pairquantities.DileptonMETQuantities,
+            pairquantities.DileptonKinematicQuantities,
 
             scalefactors.EleID_SF,
+            triggers.TriggerDecisions,
+            triggers.EETriggerSelections1,
+            triggers.EETriggerSelections2,
             triggers.EEGenerateSingleElectronTriggerFlags1,
             triggers.EEGenerateSingleElectronTriggerFlags2,
 
@@ -464,9 +479,11 @@ def build_config(
             electrons.OneGoodElectronSelection,
             pairselection.LVEl1,
             pairselection.LVEl1Uncorrected,
-            pairquantities.LepMETQuantities,
+            pairquantities.LepMETKinematicQuantities,
 
             scalefactors.EleID_SF,
+            triggers.TriggerDecisions,
+            triggers.EETriggerSelections1,
             triggers.EEGenerateSingleElectronTriggerFlags1,
 
             genparticles.gen_match_1,
@@ -475,6 +492,24 @@ def build_config(
     )
 
 
+    # only the leading jets consumed by the producers of a scope are ordered by pt,
+    # checked against the final producers of every scope after the optimization
+    configuration.add_config_parameters(
+        scopes,
+        {
+            "n_leading_jets": 2,
+            "n_leading_bjets": 2,
+        },
+    )
+    for scope in scopes:
+        configuration.add_config_parameters(
+            scope,
+            {
+                "cutflow_scope": scope,
+            },
+        )
+
+
     # modification rules
     configuration.add_modification_rule(
         "global",
@@ -483,6 +518,22 @@ def build_config(
             samples="data",
         ),
     )
+    # all MET corrections are switched off for data, use the specialized producers
+    # instead of evaluating the switches for every event
+    configuration.add_modification_rule(
+        scopes,
+        ReplaceProducer(
+            producers=[met.MetCorrections, met.MetCorrections_data],
+            samples="data",
+        ),
+    )
+    configuration.add_modification_rule(
+        scopes,
+        ReplaceProducer(
+            producers=[met.PFMetCorrections, met.PFMetCorrections_data],
+            samples="data",
+        ),
+    )
     configuration.add_modification_rule(
         ["mm", "mmet"],
         RemoveProducer(producers=scalefactors.MuonIDIso_SF, samples="data"),
@@ -494,7 +545,12 @@ def build_config(
     configuration.add_modification_rule(
         "global",
         RemoveProducer(
-            producers=[event.PUweights, event.EventGenWeight, event.npartons],
+            producers=[
+                event.PUweights,
+                event.EventGenWeight,
+                event.npartons,
+                event.SumOfWeights,
+            ],
             samples=["data"],
         ),
     )
@@ -508,9 +564,7 @@ def build_config(
         "mm",
         RemoveProducer(
             producers=[
-                genparticles.MMGenDiTauPairQuantities,
-                genparticles.gen_match_1,
-                genparticles.gen_match_2,
+                genparticles.MMGenDileptonQuantities,
             ],
             samples=["data"],
         ),
@@ -551,18 +605,16 @@ def build_config(
 
 
     # Output contents
+    configuration.add_outputs(
+            "sumw",
+            [
+                q.genweight,
+                q.npartons,
+            ],
+        )
     configuration.add_outputs(
         scopes,
         [
-            q.is_data,
-            q.is_embedding,
-            q.is_ttbar,
-            q.is_dyjets,
-            q.is_wjets,
-            q.is_ggh_htautau,
-            q.is_vbf_htautau,
-            q.is_diboson,
-
             nanoAOD.run,
             q.lumi,
             nanoAOD.event,
@@ -1051,6 +1103,8 @@ def build_config(
     # Finalize and validate the configuration
     #########################
     configuration.optimize()
-    configuration.validate()
+    check_leading_entries(configuration, "n_leading_jets", q.good_jet_collection)
+    check_leading_entries(configuration, "n_leading_bjets", q.good_bjet_collection)
+    validate_configuration(configuration)
     configuration.report()
     return configuration.expanded_configuration()
@@ -43,6 +43,13 @@ def build_config(
         available_scopes,
     )
 
+    configuration.add_config_parameters(
+        "global",
+        {
+            # file level metadata of the executable, written to its working directory
+            "metadata_file": "metadata.json",
+        },
+    )
     configuration.add_config_parameters(
         "mm",
         {
@@ -53,9 +60,13 @@ def build_config(
     configuration.add_producers(
         "global",
         [
-            event.SampleFlags,
-            event.Lumi,
+            event.MetadataRecord,
+            # the sample flags are stored as file level metadata, not per event
+            event.SampleFlagsMetadata,
             event.EventGenWeight,
+            event.npartons,
+            # the totals are stored in the metadata record in the same event loop
+            event.SumOfWeights,
         ],
     )
 
@@ -66,29 +77,20 @@ def build_config(
         ],
     )
 
+    # the summary per file is written to the metadata record by event.SumOfWeights,
+    # only the columns needed to split the sum of weights differently are written
     configuration.add_outputs(
         "mm",
         [
-            q.is_data,
-            q.is_embedding,
-            q.is_ttbar,
-            q.is_dyjets,
-            q.is_wjets,
-            q.is_ggh_htautau,
-            q.is_vbf_htautau,
-            q.is_diboson,
-
-            nanoAOD.run,
-            q.lumi,
-            nanoAOD.event,
             q.genweight,
+            q.npartons,
         ],
     )
 
     configuration.add_modification_rule(
         "global",
         RemoveProducer(
-            producers=[event.EventGenWeight],
+            producers=[event.EventGenWeight, event.npartons, event.SumOfWeights],
             samples=["data"],
         ),
     )
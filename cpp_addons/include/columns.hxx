@@ -0,0 +1,11 @@
+#ifndef GUARD_COLUMNS_H
+#define GUARD_COLUMNS_H
+
+#include "ROOT/RDataFrame.hxx"
+#include <string>
+
+namespace columns {
+ROOT::RDF::RNode Alias(ROOT::RDF::RNode df, const std::string &inputname,
+                       const std::string &outputname);
+} // end namespace columns
+#endif /* GUARD_COLUMNS_H */
@@ -0,0 +1,55 @@
+#ifndef GUARD_CUTFLOW_H
+#define GUARD_CUTFLOW_H
+
+#include "ROOT/RDataFrame.hxx"
+#include "ROOT/RVec.hxx"
+#include <string>
+#include <type_traits>
+#include <vector>
+
+namespace cutflow {
+ROOT::RDF::RNode CountAndFilter(ROOT::RDF::RNode df, const std::string &scope,
+                                const std::string &filtername,
+                                const std::string &weight,
+                                const std::vector<std::string> &flags,
+                                const std::string &values);
+ROOT::RDF::RNode CountSeen(ROOT::RDF::RNode df, const std::string &scope,
+                           const std::string &filtername,
+                           const std::string &weight);
+ROOT::RDF::RNode CountPassed(ROOT::RDF::RNode df, const std::string &scope,
+                             const std::string &filtername,
+                             const std::string &weight);
+/// Function to filter events on a set of flags, the event passes if any of
+/// the flags is true. Equivalent to basefunctions::FilterFlagsAny, in
+/// addition the events seen and passed by the filter are counted in the
+/// same event loop, plain and weighted, and added to the cutflow of the
+/// metadata record of the output. The flags are counted per scope and per
+/// shift, each shift with its own shifted flags. The flags are combined by
+/// a compiled function, no expression is jitted.
+///
+/// \param[in] df the input dataframe
+/// \param[in] scope the scope of the filter, i.e. the output the cutflow
+/// belongs to
+/// \param[in] filtername the name of the filter
+/// \param[in] weight name of the float column containing the event weight,
+/// if empty the weighted counts are the plain counts
+/// \param[in] flags names of the boolean flag columns, nominal and shifted
+///
+/// \return a filtered dataframe
+template <class... Flags>
+ROOT::RDF::RNode FilterFlagsAny(ROOT::RDF::RNode df, const std::string &scope,
+                                const std::string &filtername,
+                                const std::string &weight,
+                                const Flags &...flags) {
+    static_assert(sizeof...(Flags) > 0,
+                  "FilterFlagsAny needs at least one flag");
+    const std::vector<std::string> columns{flags...};
+    const std::string values = filtername + "_flags";
+    auto collect = [](const std::conditional_t<true, bool, Flags>... flags) {
+        return ROOT::RVec<bool>{flags...};
+    };
+    return CountAndFilter(df.Define(values, collect, columns), scope,
+                          filtername, weight, columns, values);
+}
+} // end namespace cutflow
+#endif /* GUARD_CUTFLOW_H */
@@ -0,0 +1,16 @@
+#ifndef GUARD_GENQUANTITIES_H
+#define GUARD_GENQUANTITIES_H
+
+#include "ROOT/RDataFrame.hxx"
+#include <string>
+#include <vector>
+
+namespace quantities {
+ROOT::RDF::RNode GenDileptonQuantities(
+    ROOT::RDF::RNode df, const std::vector<std::string> &outputnames,
+    const std::string &pair, const std::string &genmatch,
+    const std::string &genindex, const std::string &genparticle_pt,
+    const std::string &genparticle_eta, const std::string &genparticle_phi,
+    const std::string &genparticle_mass, const std::string &genparticle_pdgid);
+} // end namespace quantities
+#endif /* GUARD_GENQUANTITIES_H */
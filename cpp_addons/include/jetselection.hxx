@@ -0,0 +1,33 @@
+#ifndef GUARD_JETSELECTION_H
+#define GUARD_JETSELECTION_H
+
+#include "ROOT/RDataFrame.hxx"
+#include "ROOT/RVec.hxx"
+#include <string>
+#include <vector>
+
+namespace jet {
+ROOT::RDF::RNode GoodJetCollections(
+    ROOT::RDF::RNode df, const std::vector<std::string> &outputnames,
+    const std::string &jet_pt, const std::string &jet_eta,
+    const std::string &jet_phi, const std::string &jet_id,
+    const std::string &jet_puid, const std::string &btag_value,
+    const std::string &p4_1, const std::string &p4_2, const float &min_jet_pt,
+    const float &max_jet_eta, const int &min_jet_id, const int &min_jet_puid,
+    const float &jet_puid_max_pt, const float &min_bjet_pt,
+    const float &max_bjet_eta, const float &btag_cut,
+    const float &deltaR_jet_veto, const int &n_leading_jets,
+    const int &n_leading_bjets);
+ROOT::RDF::RNode GoodJetCollections(
+    ROOT::RDF::RNode df, const std::vector<std::string> &outputnames,
+    const std::string &jet_pt, const std::string &jet_eta,
+    const std::string &jet_phi, const std::string &jet_id,
+    const std::string &jet_puid, const std::string &btag_value,
+    const std::string &p4_1, const float &min_jet_pt,
+    const float &max_jet_eta, const int &min_jet_id, const int &min_jet_puid,
+    const float &jet_puid_max_pt, const float &min_bjet_pt,
+    const float &max_bjet_eta, const float &btag_cut,
+    const float &deltaR_jet_veto, const int &n_leading_jets,
+    const int &n_leading_bjets);
+} // end namespace jet
+#endif /* GUARD_JETSELECTION_H */
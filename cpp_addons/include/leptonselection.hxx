@@ -0,0 +1,39 @@
+#ifndef GUARD_LEPTONSELECTION_H
+#define GUARD_LEPTONSELECTION_H
+
+#include "ROOT/RDataFrame.hxx"
+#include "ROOT/RVec.hxx"
+#include <string>
+
+namespace physicsobject {
+ROOT::RDF::RNode FusedSelectionInMask(ROOT::RDF::RNode df,
+                                      const std::string &maskname,
+                                      const std::string &basemask,
+                                      const std::string &pt,
+                                      const std::string &eta,
+                                      const std::string &iso,
+                                      const float &min_pt,
+                                      const float &max_eta,
+                                      const float &max_iso);
+namespace muon {
+ROOT::RDF::RNode FusedSelection(ROOT::RDF::RNode df,
+                                const std::string &maskname,
+                                const std::string &pt, const std::string &eta,
+                                const std::string &dxy, const std::string &dz,
+                                const std::string &iso, const std::string &id,
+                                const float &min_pt, const float &max_eta,
+                                const float &max_dxy, const float &max_dz,
+                                const float &max_iso);
+} // end namespace muon
+namespace electron {
+ROOT::RDF::RNode FusedSelection(ROOT::RDF::RNode df,
+                                const std::string &maskname,
+                                const std::string &pt, const std::string &eta,
+                                const std::string &dxy, const std::string &dz,
+                                const std::string &iso, const std::string &id,
+                                const int &id_wp, const float &min_pt,
+                                const float &max_eta, const float &max_dxy,
+                                const float &max_dz, const float &max_iso);
+} // end namespace electron
+} // end namespace physicsobject
+#endif /* GUARD_LEPTONSELECTION_H */
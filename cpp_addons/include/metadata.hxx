@@ -0,0 +1,24 @@
+#ifndef GUARD_METADATA_H
+#define GUARD_METADATA_H
+
+#include "ROOT/RDataFrame.hxx"
+#include <string>
+#include <vector>
+
+namespace metadata {
+ROOT::RDF::RNode Open(ROOT::RDF::RNode df, const std::string &filename);
+void SetSampleFlags(const std::vector<std::string> &names,
+                    const std::vector<bool> &values);
+void AddCutflowEntry(const std::string &scope, const std::string &shift,
+                     const std::string &filtername,
+                     const unsigned long long events,
+                     const unsigned long long passed, const double sumw,
+                     const double sumw_passed);
+void SetSumOfWeights(const unsigned long long nevents, const double sumw,
+                     const double sumw2,
+                     const std::vector<double> &sumw_per_npartons);
+ROOT::RDF::RNode SampleFlags(ROOT::RDF::RNode df,
+                             const std::vector<std::string> &names,
+                             const std::vector<bool> &values);
+} // end namespace metadata
+#endif /* GUARD_METADATA_H */
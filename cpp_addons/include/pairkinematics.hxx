@@ -0,0 +1,23 @@
+#ifndef GUARD_PAIRKINEMATICS_H
+#define GUARD_PAIRKINEMATICS_H
+
+#include "ROOT/RDataFrame.hxx"
+#include <string>
+#include <vector>
+
+namespace quantities {
+ROOT::RDF::RNode LeptonKinematics(ROOT::RDF::RNode df,
+                                  const std::vector<std::string> &outputnames,
+                                  const std::string &p4_1);
+ROOT::RDF::RNode DileptonKinematics(ROOT::RDF::RNode df,
+                                    const std::vector<std::string> &outputnames,
+                                    const std::string &p4_1,
+                                    const std::string &p4_2);
+ROOT::RDF::RNode
+DileptonMETKinematics(ROOT::RDF::RNode df,
+                      const std::vector<std::string> &outputnames,
+                      const std::string &p4_1, const std::string &p4_2,
+                      const std::string &jet_p4_1,
+                      const std::string &jet_p4_2, const std::string &met);
+} // end namespace quantities
+#endif /* GUARD_PAIRKINEMATICS_H */
@@ -0,0 +1,11 @@
+#ifndef GUARD_SUMOFWEIGHTS_H
+#define GUARD_SUMOFWEIGHTS_H
+
+#include "ROOT/RDataFrame.hxx"
+#include <string>
+
+namespace sumofweights {
+ROOT::RDF::RNode Accumulate(ROOT::RDF::RNode df, const std::string &genweight,
+                            const std::string &npartons);
+} // end namespace sumofweights
+#endif /* GUARD_SUMOFWEIGHTS_H */
@@ -0,0 +1,48 @@
+#ifndef GUARD_TRIGGERFLAGS_H
+#define GUARD_TRIGGERFLAGS_H
+
+#include "ROOT/RDataFrame.hxx"
+#include "ROOT/RVec.hxx"
+#include <string>
+#include <type_traits>
+#include <vector>
+
+namespace trigger {
+ROOT::RDF::RNode DefineMissingPaths(ROOT::RDF::RNode df,
+                                    const std::vector<std::string> &hlt_paths);
+/// Function to read the decisions of a set of HLT paths into one column.
+/// Every path is read once as a typed boolean column by a compiled function,
+/// paths not available in the input are set to false.
+///
+/// \param[in] df the input dataframe
+/// \param[out] outputname name of the new column, containing one decision
+/// per path, in the order of hlt_paths
+/// \param[in] hlt_paths names of the HLT path branches, without duplicates
+///
+/// \return a dataframe containing the new column
+template <class... Paths>
+ROOT::RDF::RNode HLTDecisions(ROOT::RDF::RNode df,
+                              const std::string &outputname,
+                              const Paths &...hlt_paths) {
+    const std::vector<std::string> paths{hlt_paths...};
+    auto decisions = [](const std::conditional_t<true, bool, Paths>... fired) {
+        return ROOT::RVec<int>{static_cast<int>(fired)...};
+    };
+    return DefineMissingPaths(df, paths).Define(outputname, decisions, paths);
+}
+ROOT::RDF::RNode MatchTriggerSelections(
+    ROOT::RDF::RNode df, const std::string &outputname,
+    const std::string &decisions, const std::string &particle_p4,
+    const std::string &triggerobject_bits, const std::string &triggerobject_id,
+    const std::string &triggerobject_pt, const std::string &triggerobject_eta,
+    const std::string &triggerobject_phi, const std::vector<int> &path_index,
+    const std::vector<float> &ptcut, const std::vector<float> &etacut,
+    const std::vector<int> &trigger_particle_id,
+    const std::vector<int> &filterbit,
+    const std::vector<float> &max_deltaR_triggermatch);
+ROOT::RDF::RNode UnpackTriggerFlag(ROOT::RDF::RNode df,
+                                   const std::string &outputname,
+                                   const std::string &matches,
+                                   const int &selection_index);
+} // end namespace trigger
+#endif /* GUARD_TRIGGERFLAGS_H */
@@ -0,0 +1,24 @@
+#ifndef GUARD_COLUMNS_H
+#define GUARD_COLUMNS_H
+
+#include "ROOT/RDataFrame.hxx"
+#include <string>
+
+namespace columns {
+/// Function to make a column available under a new name. Equivalent to
+/// basefunctions::rename, but the new column is an alias of the input
+/// column instead of a Define, so no value is copied per event and no
+/// lambda has to be compiled. The alias has the type of the input column and
+/// is written to the output like any other column.
+///
+/// \param[in] df the input dataframe
+/// \param[in] inputname name of the existing column
+/// \param[out] outputname the new name of the column
+///
+/// \return a dataframe containing the alias
+ROOT::RDF::RNode Alias(ROOT::RDF::RNode df, const std::string &inputname,
+                       const std::string &outputname) {
+    return df.Alias(outputname, inputname);
+}
+} // end namespace columns
+#endif /* GUARD_COLUMNS_H */
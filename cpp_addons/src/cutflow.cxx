@@ -0,0 +1,259 @@
+#ifndef GUARD_CUTFLOW_H
+#define GUARD_CUTFLOW_H
+
+#include "ROOT/RDataFrame.hxx"
+#include "ROOT/RVec.hxx"
+#include <algorithm>
+#include <functional>
+#include <map>
+#include <memory>
+#include <mutex>
+#include <numeric>
+#include <stdexcept>
+#include <string>
+#include <utility>
+#include <vector>
+
+namespace metadata {
+void AddCutflowEntry(const std::string &scope, const std::string &shift,
+                     const std::string &filtername,
+                     const unsigned long long events,
+                     const unsigned long long passed, const double sumw,
+                     const double sumw_passed);
+} // end namespace metadata
+
+namespace cutflow {
+/// Per slot counters of the events seen and passed by a filter, plain and
+/// weighted. The counters are owned by the filter in the computation graph
+/// and added to the cutflow of the metadata record when the graph is
+/// destroyed after the event loop.
+class Counter {
+  public:
+    Counter(const std::string &scope, const std::string &shift,
+            const std::string &filtername, const unsigned int nslots)
+        : scope_(scope), shift_(shift), filtername_(filtername),
+          events_(nslots, 0), passed_(nslots, 0), sumw_(nslots, 0.),
+          sumw_passed_(nslots, 0.) {}
+    void Seen(const unsigned int slot, const double weight) {
+        events_[slot] += 1;
+        sumw_[slot] += weight;
+    }
+    void Passed(const unsigned int slot, const double weight) {
+        passed_[slot] += 1;
+        sumw_passed_[slot] += weight;
+    }
+    void Fill(const unsigned int slot, const bool pass, const double weight) {
+        Seen(slot, weight);
+        if (pass)
+            Passed(slot, weight);
+    }
+    ~Counter() {
+        if (Sum(events_) == 0)
+            return;
+        metadata::AddCutflowEntry(scope_, shift_, filtername_, Sum(events_),
+                                  Sum(passed_), Sum(sumw_), Sum(sumw_passed_));
+    }
+
+  private:
+    template <typename T> static T Sum(const std::vector<T> &values) {
+        return std::accumulate(values.begin(), values.end(), T(0));
+    }
+    std::string scope_;
+    std::string shift_;
+    std::string filtername_;
+    std::vector<unsigned long long> events_;
+    std::vector<unsigned long long> passed_;
+    std::vector<double> sumw_;
+    std::vector<double> sumw_passed_;
+};
+
+/// Function to group the flags of a filter by shift. Shifted columns carry
+/// the shift as suffix, e.g. flag__muonEsUp. The nominal group contains the
+/// unshifted flags, the group of a shift contains the shifted flags and the
+/// nominal flags without a shifted version, i.e. the flags the filter is
+/// evaluated on in that shift.
+///
+/// \param[in] flags names of the flag columns
+///
+/// \return pairs of the shift, nominal for the unshifted flags, and the
+/// indices of its flags, the nominal first
+std::vector<std::pair<std::string, std::vector<std::size_t>>>
+ShiftGroups(const std::vector<std::string> &flags) {
+    std::vector<std::string> shifts{"nominal"};
+    // index of every flag by its base name and shift
+    std::map<std::string, std::map<std::string, std::size_t>> indices;
+    std::vector<std::string> bases;
+    for (std::size_t i = 0; i < flags.size(); ++i) {
+        const auto position = flags[i].find("__");
+        const std::string base = flags[i].substr(0, position);
+        const std::string shift = position == std::string::npos
+                                      ? "nominal"
+                                      : flags[i].substr(position + 2);
+        if (indices.find(base) == indices.end())
+            bases.push_back(base);
+        if (std::find(shifts.begin(), shifts.end(), shift) == shifts.end())
+            shifts.push_back(shift);
+        indices[base][shift] = i;
+    }
+    std::vector<std::pair<std::string, std::vector<std::size_t>>> groups;
+    for (const auto &shift : shifts) {
+        std::vector<std::size_t> group;
+        for (const auto &base : bases) {
+            const auto &variants = indices[base];
+            auto variant = variants.find(shift);
+            if (variant == variants.end())
+                variant = variants.find("nominal");
+            if (variant != variants.end())
+                group.push_back(variant->second);
+        }
+        if (!group.empty())
+            groups.emplace_back(shift, group);
+    }
+    return groups;
+}
+/// Function to count the events seen and passed by a filter on a set of
+/// flags and to apply it. The flags are counted per shift, each shift with
+/// its own flags, and the event passes the filter if any of the flags is
+/// true, so that it is kept for every shift it passes in. The counting is
+/// done by a compiled function in the event loop of the filter, so no
+/// additional pass over the events is needed.
+///
+/// \param[in] df the input dataframe
+/// \param[in] scope the scope of the filter
+/// \param[in] filtername the name of the filter
+/// \param[in] weight name of the float column containing the event weight,
+/// if empty the weighted counts are the plain counts
+/// \param[in] flags names of the flag columns
+/// \param[in] values name of the column containing the values of the flags,
+/// in the order of flags
+///
+/// \return a filtered dataframe
+ROOT::RDF::RNode CountAndFilter(ROOT::RDF::RNode df, const std::string &scope,
+                                const std::string &filtername,
+                                const std::string &weight,
+                                const std::vector<std::string> &flags,
+                                const std::string &values) {
+    std::vector<std::shared_ptr<Counter>> counters;
+    std::vector<std::vector<std::size_t>> groups;
+    for (const auto &group : ShiftGroups(flags)) {
+        counters.push_back(std::make_shared<Counter>(
+            scope, group.first, filtername, df.GetNSlots()));
+        groups.push_back(group.second);
+    }
+    auto count = [counters, groups](const unsigned int slot,
+                                    const ROOT::RVec<bool> &flags,
+                                    const double weight) {
+        for (std::size_t i = 0; i < groups.size(); ++i) {
+            bool pass = false;
+            for (const auto index : groups[i]) {
+                pass = pass || flags[index];
+            }
+            counters[i]->Fill(slot, pass, weight);
+        }
+        return ROOT::VecOps::Any(flags);
+    };
+    const std::string counted = values + "_counted";
+    auto pass = [](const bool value) { return value; };
+    if (weight.empty()) {
+        auto unweighted = [count](const unsigned int slot,
+                                  const ROOT::RVec<bool> &flags) {
+            return count(slot, flags, 1.);
+        };
+        return df.DefineSlot(counted, unweighted, {values})
+            .Filter(pass, {counted}, filtername);
+    }
+    auto weighted = [count](const unsigned int slot,
+                            const ROOT::RVec<bool> &flags, const float weight) {
+        return count(slot, flags, weight);
+    };
+    return df.DefineSlot(counted, weighted, {values, weight})
+        .Filter(pass, {counted}, filtername);
+}
+
+/// Counters of filters applied by other functions, between counting the
+/// events seen and the events passed
+std::map<std::string, std::shared_ptr<Counter>> &PendingCounters() {
+    static std::map<std::string, std::shared_ptr<Counter>> counters;
+    return counters;
+}
+std::mutex &PendingCountersMutex() {
+    static std::mutex mutex;
+    return mutex;
+}
+/// Function to call a counting function for every event passing the
+/// dataframe, without filtering any event.
+ROOT::RDF::RNode
+PassThrough(ROOT::RDF::RNode df, const std::string &name,
+            const std::string &weight,
+            const std::function<void(unsigned int, double)> &fill) {
+    auto pass = [](const bool value) { return value; };
+    if (weight.empty()) {
+        auto count = [fill](const unsigned int slot) {
+            fill(slot, 1.);
+            return true;
+        };
+        return df.DefineSlot(name, count, {}).Filter(pass, {name});
+    }
+    auto count = [fill](const unsigned int slot, const float weight) {
+        fill(slot, weight);
+        return true;
+    };
+    return df.DefineSlot(name, count, {weight}).Filter(pass, {name});
+}
+/// Function to count the events seen by a filter of another function, e.g.
+/// basefunctions::JSONFilter. It has to be followed by the filter and by
+/// cutflow::CountPassed with the same scope and filtername. No event is
+/// filtered.
+///
+/// \param[in] df the input dataframe
+/// \param[in] scope the scope of the filter
+/// \param[in] filtername the name of the filter
+/// \param[in] weight name of the float column containing the event weight,
+/// if empty the weighted counts are the plain counts
+///
+/// \return the unfiltered dataframe
+ROOT::RDF::RNode CountSeen(ROOT::RDF::RNode df, const std::string &scope,
+                           const std::string &filtername,
+                           const std::string &weight) {
+    auto counter =
+        std::make_shared<Counter>(scope, "nominal", filtername, df.GetNSlots());
+    {
+        std::lock_guard<std::mutex> lock(PendingCountersMutex());
+        PendingCounters()[scope + "/" + filtername] = counter;
+    }
+    return PassThrough(df, filtername + "_seen", weight,
+                       [counter](const unsigned int slot, const double weight) {
+                           counter->Seen(slot, weight);
+                       });
+}
+/// Function to count the events passed by a filter of another function,
+/// counterpart of cutflow::CountSeen. No event is filtered.
+///
+/// \param[in] df the input dataframe
+/// \param[in] scope the scope of the filter
+/// \param[in] filtername the name of the filter
+/// \param[in] weight name of the float column containing the event weight,
+/// if empty the weighted counts are the plain counts
+///
+/// \return the unfiltered dataframe
+ROOT::RDF::RNode CountPassed(ROOT::RDF::RNode df, const std::string &scope,
+                             const std::string &filtername,
+                             const std::string &weight) {
+    std::shared_ptr<Counter> counter;
+    {
+        std::lock_guard<std::mutex> lock(PendingCountersMutex());
+        auto pending = PendingCounters().find(scope + "/" + filtername);
+        if (pending == PendingCounters().end()) {
+            throw std::runtime_error("CountPassed of " + filtername +
+                                     " without CountSeen");
+        }
+        counter = pending->second;
+        PendingCounters().erase(pending);
+    }
+    return PassThrough(df, filtername + "_passed", weight,
+                       [counter](const unsigned int slot, const double weight) {
+                           counter->Passed(slot, weight);
+                       });
+}
+} // end namespace cutflow
+#endif /* GUARD_CUTFLOW_H */
@@ -0,0 +1,141 @@
+#ifndef GUARD_GENQUANTITIES_H
+#define GUARD_GENQUANTITIES_H
+
+#include "../../../../include/defaults.hxx"
+#include "../../../../include/utility/Logger.hxx"
+#include "Math/Vector4D.h"
+#include "ROOT/RDataFrame.hxx"
+#include "ROOT/RVec.hxx"
+#include <stdexcept>
+#include <string>
+#include <vector>
+
+namespace quantities {
+/// Gen level quantities of the two leptons of a pair
+struct GenDileptonPair {
+    int match[2];
+    int pdgid[2];
+    float pt[2];
+    float eta[2];
+    float phi[2];
+    float mass[2];
+    float m_vis;
+};
+/// Function to resolve the truth matching and the gen level kinematics of
+/// both leptons of a pair in one go. The gen particle of each lepton is
+/// looked up once and all columns are filled from a single result.
+/// Equivalent to gen_match_1/2 and the MMGenDiTauPairQuantities group, i.e.
+/// buildgenpair, the gen lorentz vectors and their unrolled quantities.
+///
+/// The quantities are, in the order of the outputnames:
+///   - gen_match, pt, eta, phi, mass and pdgid of the first lepton
+///   - gen_match, pt, eta, phi, mass and pdgid of the second lepton
+///   - m_vis of the two gen particles
+/// Leptons without gen particle get default values, except for the
+/// gen_match, which is taken from the reco lepton.
+///
+/// \param[in] df the input dataframe
+/// \param[out] outputnames names of the 13 output columns
+/// \param[in] pair name of the column containing the indices of the two
+/// leptons
+/// \param[in] genmatch name of the column containing the gen match flags of
+/// the leptons, e.g. Muon_genPartFlav
+/// \param[in] genindex name of the column containing the index of the gen
+/// particle of the leptons, e.g. Muon_genPartIdx
+/// \param[in] genparticle_pt name of the column containing the gen particle
+/// pts
+/// \param[in] genparticle_eta name of the column containing the gen particle
+/// etas
+/// \param[in] genparticle_phi name of the column containing the gen particle
+/// phis
+/// \param[in] genparticle_mass name of the column containing the gen particle
+/// masses
+/// \param[in] genparticle_pdgid name of the column containing the gen
+/// particle pdgids
+///
+/// \return a dataframe containing the new columns
+ROOT::RDF::RNode GenDileptonQuantities(
+    ROOT::RDF::RNode df, const std::vector<std::string> &outputnames,
+    const std::string &pair, const std::string &genmatch,
+    const std::string &genindex, const std::string &genparticle_pt,
+    const std::string &genparticle_eta, const std::string &genparticle_phi,
+    const std::string &genparticle_mass, const std::string &genparticle_pdgid) {
+    if (outputnames.size() != 13) {
+        Logger::get("GenDileptonQuantities")
+            ->error("Expected 13 output columns, got {}", outputnames.size());
+        throw std::runtime_error("Wrong number of outputs");
+    }
+    auto calculate = [](const ROOT::RVec<int> &pair,
+                        const ROOT::RVec<UChar_t> &genmatch,
+                        const ROOT::RVec<int> &genindex,
+                        const ROOT::RVec<float> &pts,
+                        const ROOT::RVec<float> &etas,
+                        const ROOT::RVec<float> &phis,
+                        const ROOT::RVec<float> &masses,
+                        const ROOT::RVec<int> &pdgids) {
+        GenDileptonPair gen;
+        ROOT::Math::PtEtaPhiMVector p4[2];
+        bool valid = true;
+        for (std::size_t leg = 0; leg < 2; ++leg) {
+            const int lepton = pair.at(leg);
+            const int index = lepton >= 0 ? genindex.at(lepton) : -1;
+            gen.match[leg] = lepton >= 0 ? genmatch.at(lepton) : default_int;
+            if (index < 0) {
+                valid = false;
+                gen.pdgid[leg] = default_int;
+                gen.pt[leg] = default_float;
+                gen.eta[leg] = default_float;
+                gen.phi[leg] = default_float;
+                gen.mass[leg] = default_float;
+                continue;
+            }
+            p4[leg] = ROOT::Math::PtEtaPhiMVector(pts.at(index), etas.at(index),
+                                                  phis.at(index),
+                                                  masses.at(index));
+            gen.pdgid[leg] = pdgids.at(index);
+            gen.pt[leg] = pts.at(index);
+            gen.eta[leg] = etas.at(index);
+            gen.phi[leg] = phis.at(index);
+            gen.mass[leg] = masses.at(index);
+        }
+        gen.m_vis = valid ? (float)(p4[0] + p4[1]).mass() : default_float;
+        return gen;
+    };
+    auto genpair = outputnames.at(0) + "_gen_dilepton_quantities";
+    auto df1 = df.Define(genpair, calculate,
+                         {pair, genmatch, genindex, genparticle_pt,
+                          genparticle_eta, genparticle_phi, genparticle_mass,
+                          genparticle_pdgid});
+    for (std::size_t leg = 0; leg < 2; ++leg) {
+        const std::size_t offset = 6 * leg;
+        df1 = df1.Define(
+            outputnames.at(offset),
+            [leg](const GenDileptonPair &gen) { return gen.match[leg]; },
+            {genpair});
+        df1 = df1.Define(
+            outputnames.at(offset + 1),
+            [leg](const GenDileptonPair &gen) { return gen.pt[leg]; },
+            {genpair});
+        df1 = df1.Define(
+            outputnames.at(offset + 2),
+            [leg](const GenDileptonPair &gen) { return gen.eta[leg]; },
+            {genpair});
+        df1 = df1.Define(
+            outputnames.at(offset + 3),
+            [leg](const GenDileptonPair &gen) { return gen.phi[leg]; },
+            {genpair});
+        df1 = df1.Define(
+            outputnames.at(offset + 4),
+            [leg](const GenDileptonPair &gen) { return gen.mass[leg]; },
+            {genpair});
+        df1 = df1.Define(
+            outputnames.at(offset + 5),
+            [leg](const GenDileptonPair &gen) { return gen.pdgid[leg]; },
+            {genpair});
+    }
+    return df1.Define(
+        outputnames.at(12),
+        [](const GenDileptonPair &gen) { return gen.m_vis; }, {genpair});
+}
+} // end namespace quantities
+#endif /* GUARD_GENQUANTITIES_H */
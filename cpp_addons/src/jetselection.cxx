@@ -0,0 +1,237 @@
+#ifndef GUARD_JETSELECTION_H
+#define GUARD_JETSELECTION_H
+
+#include "../../../../include/utility/Logger.hxx"
+#include "Math/Vector3D.h"
+#include "Math/Vector4D.h"
+#include "Math/VectorUtil.h"
+#include "ROOT/RDataFrame.hxx"
+#include "ROOT/RVec.hxx"
+#include <algorithm>
+#include <cmath>
+#include <string>
+#include <utility>
+#include <vector>
+
+namespace jet {
+/// Order the jet indices by descending pt. If n_leading is not negative,
+/// only the n_leading highest pt jets are ordered and placed in front, the
+/// remaining indices follow in unspecified order.
+///
+/// \param[in,out] indices the jet indices to be ordered
+/// \param[in] jet_pt the jet pts
+/// \param[in] n_leading number of leading jets to be ordered, -1 for all
+inline void OrderLeadingJetsByPt(ROOT::RVec<int> &indices,
+                                 const ROOT::RVec<float> &jet_pt,
+                                 const int &n_leading) {
+    auto by_pt = [&jet_pt](const int &a, const int &b) {
+        return jet_pt[a] > jet_pt[b];
+    };
+    if (n_leading >= 0 &&
+        static_cast<std::size_t>(n_leading) < indices.size()) {
+        std::partial_sort(indices.begin(), indices.begin() + n_leading,
+                          indices.end(), by_pt);
+    } else {
+        std::stable_sort(indices.begin(), indices.end(), by_pt);
+    }
+}
+/// Implementation of the fused jet selection, the leptons to veto against
+/// are passed as a vector of lorentz vectors.
+///
+/// \return a pair of the good jet and the good b-jet indices, the leading
+/// n_leading_jets and n_leading_bjets of them ordered by descending pt
+inline auto SelectJetCollections(
+    const ROOT::RVec<float> &jet_pt, const ROOT::RVec<float> &jet_eta,
+    const ROOT::RVec<float> &jet_phi, const ROOT::RVec<int> &jet_id,
+    const ROOT::RVec<int> &jet_puid, const ROOT::RVec<float> &btag_value,
+    const std::vector<ROOT::Math::PtEtaPhiMVector> &leptons,
+    const float &min_jet_pt, const float &max_jet_eta, const int &min_jet_id,
+    const int &min_jet_puid, const float &jet_puid_max_pt,
+    const float &min_bjet_pt, const float &max_bjet_eta,
+    const float &btag_cut, const float &deltaR_jet_veto,
+    const int &n_leading_jets, const int &n_leading_bjets) {
+    ROOT::RVec<int> jets;
+    ROOT::RVec<int> bjets;
+    jets.reserve(jet_pt.size());
+    bjets.reserve(jet_pt.size());
+    for (std::size_t idx = 0; idx < jet_pt.size(); ++idx) {
+        // jet ID and pileup ID are shared by jets and b-jets
+        if (jet_id[idx] < min_jet_id ||
+            (jet_puid[idx] < min_jet_puid && jet_pt[idx] < jet_puid_max_pt)) {
+            continue;
+        }
+        const bool is_jet =
+            jet_pt[idx] > min_jet_pt && std::abs(jet_eta[idx]) < max_jet_eta;
+        const bool is_bjet = jet_pt[idx] > min_bjet_pt &&
+                             std::abs(jet_eta[idx]) < max_bjet_eta &&
+                             btag_value[idx] > btag_cut;
+        if (!is_jet && !is_bjet) {
+            continue;
+        }
+        // the overlap veto is only evaluated for jets passing the cuts
+        ROOT::Math::RhoEtaPhiVectorF jet(0, jet_eta[idx], jet_phi[idx]);
+        bool overlap = false;
+        for (const auto &lepton : leptons) {
+            if (ROOT::Math::VectorUtil::DeltaR(jet, lepton) <=
+                deltaR_jet_veto) {
+                overlap = true;
+                break;
+            }
+        }
+        if (overlap) {
+            continue;
+        }
+        if (is_jet) {
+            jets.push_back(idx);
+        }
+        if (is_bjet) {
+            bjets.push_back(idx);
+        }
+    }
+    OrderLeadingJetsByPt(jets, jet_pt, n_leading_jets);
+    OrderLeadingJetsByPt(bjets, jet_pt, n_leading_bjets);
+    Logger::get("GoodJetCollections")
+        ->debug("jets {}, bjets {}", jets, bjets);
+    return std::make_pair(jets, bjets);
+}
+/// Split the pair of jet collections into the two output columns.
+///
+/// \param[in] df the input dataframe
+/// \param[out] outputnames names of the good jet and good b-jet collections
+/// \param[in] pairname name of the column containing the pair of collections
+///
+/// \return a dataframe containing the two collections
+inline ROOT::RDF::RNode SplitJetCollections(
+    ROOT::RDF::RNode df, const std::vector<std::string> &outputnames,
+    const std::string &pairname) {
+    using collections = std::pair<ROOT::RVec<int>, ROOT::RVec<int>>;
+    auto df1 = df.Define(
+        outputnames.at(0),
+        [](const collections &jets) { return jets.first; }, {pairname});
+    return df1.Define(
+        outputnames.at(1),
+        [](const collections &jets) { return jets.second; }, {pairname});
+}
+/// Function to select the good jets and good b-jets of a scope in a single
+/// loop over the jets. The jet ID, pileup ID (only applied below
+/// jet_puid_max_pt), kinematic and b-tag selections, the veto of jets
+/// overlapping with the two leptons and the ordering by pt are done at once.
+/// Only the leading jets consumed downstream have to be ordered, so the
+/// ordering is restricted to the leading n_leading_jets and n_leading_bjets
+/// entries, all selected jets are kept in the collections.
+/// Equivalent to GoodJets and GoodBJets combined with VetoOverlappingJets and
+/// OrderJetsByPt, without the intermediate masks.
+///
+/// \param[in] df the input dataframe
+/// \param[out] outputnames names of the good jet and good b-jet collections,
+/// the indices of the selected jets ordered by descending pt
+/// \param[in] jet_pt name of the column containing the corrected jet pts
+/// \param[in] jet_eta name of the column containing the jet etas
+/// \param[in] jet_phi name of the column containing the jet phis
+/// \param[in] jet_id name of the column containing the jet IDs
+/// \param[in] jet_puid name of the column containing the jet pileup IDs
+/// \param[in] btag_value name of the column containing the b-tag values
+/// \param[in] p4_1 name of the column containing the first lepton
+/// \param[in] p4_2 name of the column containing the second lepton
+/// \param[in] min_jet_pt minimal pt of good jets
+/// \param[in] max_jet_eta maximal absolute eta of good jets
+/// \param[in] min_jet_id minimal jet ID of jets and b-jets
+/// \param[in] min_jet_puid minimal pileup ID of jets and b-jets
+/// \param[in] jet_puid_max_pt jets above this pt pass the pileup ID
+/// \param[in] min_bjet_pt minimal pt of good b-jets
+/// \param[in] max_bjet_eta maximal absolute eta of good b-jets
+/// \param[in] btag_cut minimal b-tag value of good b-jets
+/// \param[in] deltaR_jet_veto minimal deltaR between a jet and the leptons
+/// \param[in] n_leading_jets number of leading good jets to be ordered by pt,
+/// -1 to order all of them
+/// \param[in] n_leading_bjets number of leading good b-jets to be ordered by
+/// pt, -1 to order all of them
+///
+/// \return a dataframe containing the good jet and good b-jet collections
+ROOT::RDF::RNode GoodJetCollections(
+    ROOT::RDF::RNode df, const std::vector<std::string> &outputnames,
+    const std::string &jet_pt, const std::string &jet_eta,
+    const std::string &jet_phi, const std::string &jet_id,
+    const std::string &jet_puid, const std::string &btag_value,
+    const std::string &p4_1, const std::string &p4_2, const float &min_jet_pt,
+    const float &max_jet_eta, const int &min_jet_id, const int &min_jet_puid,
+    const float &jet_puid_max_pt, const float &min_bjet_pt,
+    const float &max_bjet_eta, const float &btag_cut,
+    const float &deltaR_jet_veto, const int &n_leading_jets,
+    const int &n_leading_bjets) {
+    auto pairname = outputnames.at(0) + "_" + outputnames.at(1);
+    auto df1 = df.Define(
+        pairname,
+        [=](const ROOT::RVec<float> &jet_pt, const ROOT::RVec<float> &jet_eta,
+            const ROOT::RVec<float> &jet_phi, const ROOT::RVec<int> &jet_id,
+            const ROOT::RVec<int> &jet_puid,
+            const ROOT::RVec<float> &btag_value,
+            const ROOT::Math::PtEtaPhiMVector &p4_1,
+            const ROOT::Math::PtEtaPhiMVector &p4_2) {
+            return SelectJetCollections(
+                jet_pt, jet_eta, jet_phi, jet_id, jet_puid, btag_value,
+                {p4_1, p4_2}, min_jet_pt, max_jet_eta, min_jet_id,
+                min_jet_puid, jet_puid_max_pt, min_bjet_pt, max_bjet_eta,
+                btag_cut, deltaR_jet_veto, n_leading_jets, n_leading_bjets);
+        },
+        {jet_pt, jet_eta, jet_phi, jet_id, jet_puid, btag_value, p4_1, p4_2});
+    return SplitJetCollections(df1, outputnames, pairname);
+}
+/// Function to select the good jets and good b-jets of a scope with a single
+/// lepton in a single loop over the jets, see the two lepton version above.
+///
+/// \param[in] df the input dataframe
+/// \param[out] outputnames names of the good jet and good b-jet collections,
+/// the indices of the selected jets ordered by descending pt
+/// \param[in] jet_pt name of the column containing the corrected jet pts
+/// \param[in] jet_eta name of the column containing the jet etas
+/// \param[in] jet_phi name of the column containing the jet phis
+/// \param[in] jet_id name of the column containing the jet IDs
+/// \param[in] jet_puid name of the column containing the jet pileup IDs
+/// \param[in] btag_value name of the column containing the b-tag values
+/// \param[in] p4_1 name of the column containing the lepton
+/// \param[in] min_jet_pt minimal pt of good jets
+/// \param[in] max_jet_eta maximal absolute eta of good jets
+/// \param[in] min_jet_id minimal jet ID of jets and b-jets
+/// \param[in] min_jet_puid minimal pileup ID of jets and b-jets
+/// \param[in] jet_puid_max_pt jets above this pt pass the pileup ID
+/// \param[in] min_bjet_pt minimal pt of good b-jets
+/// \param[in] max_bjet_eta maximal absolute eta of good b-jets
+/// \param[in] btag_cut minimal b-tag value of good b-jets
+/// \param[in] deltaR_jet_veto minimal deltaR between a jet and the lepton
+/// \param[in] n_leading_jets number of leading good jets to be ordered by pt,
+/// -1 to order all of them
+/// \param[in] n_leading_bjets number of leading good b-jets to be ordered by
+/// pt, -1 to order all of them
+///
+/// \return a dataframe containing the good jet and good b-jet collections
+ROOT::RDF::RNode GoodJetCollections(
+    ROOT::RDF::RNode df, const std::vector<std::string> &outputnames,
+    const std::string &jet_pt, const std::string &jet_eta,
+    const std::string &jet_phi, const std::string &jet_id,
+    const std::string &jet_puid, const std::string &btag_value,
+    const std::string &p4_1, const float &min_jet_pt,
+    const float &max_jet_eta, const int &min_jet_id, const int &min_jet_puid,
+    const float &jet_puid_max_pt, const float &min_bjet_pt,
+    const float &max_bjet_eta, const float &btag_cut,
+    const float &deltaR_jet_veto, const int &n_leading_jets,
+    const int &n_leading_bjets) {
+    auto pairname = outputnames.at(0) + "_" + outputnames.at(1);
+    auto df1 = df.Define(
+        pairname,
+        [=](const ROOT::RVec<float> &jet_pt, const ROOT::RVec<float> &jet_eta,
+            const ROOT::RVec<float> &jet_phi, const ROOT::RVec<int> &jet_id,
+            const ROOT::RVec<int> &jet_puid,
+            const ROOT::RVec<float> &btag_value,
+            const ROOT::Math::PtEtaPhiMVector &p4_1) {
+            return SelectJetCollections(
+                jet_pt, jet_eta, jet_phi, jet_id, jet_puid, btag_value, {p4_1},
+                min_jet_pt, max_jet_eta, min_jet_id, min_jet_puid,
+                jet_puid_max_pt, min_bjet_pt, max_bjet_eta, btag_cut,
+                deltaR_jet_veto, n_leading_jets, n_leading_bjets);
+        },
+        {jet_pt, jet_eta, jet_phi, jet_id, jet_puid, btag_value, p4_1});
+    return SplitJetCollections(df1, outputnames, pairname);
+}
+} // end namespace jet
+#endif /* GUARD_JETSELECTION_H */
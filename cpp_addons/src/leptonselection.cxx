@@ -0,0 +1,156 @@
+#ifndef GUARD_LEPTONSELECTION_H
+#define GUARD_LEPTONSELECTION_H
+
+#include "../../../../include/utility/Logger.hxx"
+#include "ROOT/RDataFrame.hxx"
+#include "ROOT/RVec.hxx"
+#include <cmath>
+#include <string>
+
+namespace physicsobject {
+/// Function to refine an existing object mask with a pt, eta and isolation
+/// selection in a single loop over the objects. Equivalent to combining the
+/// base mask with CutPt, CutEta and CutIsolation, without the intermediate
+/// masks.
+///
+/// \param[in] df the input dataframe
+/// \param[out] maskname the name of the new mask to be added as column to
+/// the dataframe
+/// \param[in] basemask the name of the column containing the mask to be
+/// refined
+/// \param[in] pt name of the column containing the object pts
+/// \param[in] eta name of the column containing the object etas
+/// \param[in] iso name of the column containing the object isolations
+/// \param[in] min_pt minimal pt value, objects must have pt > min_pt
+/// \param[in] max_eta maximal eta value, objects must have |eta| < max_eta
+/// \param[in] max_iso maximal isolation value, objects must have iso <
+/// max_iso
+///
+/// \return a dataframe containing the new mask
+ROOT::RDF::RNode FusedSelectionInMask(ROOT::RDF::RNode df,
+                                      const std::string &maskname,
+                                      const std::string &basemask,
+                                      const std::string &pt,
+                                      const std::string &eta,
+                                      const std::string &iso,
+                                      const float &min_pt,
+                                      const float &max_eta,
+                                      const float &max_iso) {
+    auto selection = [min_pt, max_eta,
+                      max_iso](const ROOT::RVec<int> &basemask,
+                               const ROOT::RVec<float> &pt,
+                               const ROOT::RVec<float> &eta,
+                               const ROOT::RVec<float> &iso) {
+        ROOT::RVec<int> mask(basemask.size());
+        for (std::size_t i = 0; i < basemask.size(); ++i) {
+            mask[i] = basemask[i] && pt[i] > min_pt &&
+                      std::abs(eta[i]) < max_eta && iso[i] < max_iso;
+        }
+        Logger::get("FusedSelectionInMask")->debug("mask {}", mask);
+        return mask;
+    };
+    return df.Define(maskname, selection, {basemask, pt, eta, iso});
+}
+namespace muon {
+/// Function to select muons with a pt, eta, impact parameter, ID and
+/// isolation selection in a single loop over the muons. Equivalent to
+/// combining CutPt, CutEta, CutDxy, CutDz, muon::CutID and
+/// muon::CutIsolation, without the intermediate masks.
+///
+/// \param[in] df the input dataframe
+/// \param[out] maskname the name of the new mask to be added as column to
+/// the dataframe
+/// \param[in] pt name of the column containing the muon pts
+/// \param[in] eta name of the column containing the muon etas
+/// \param[in] dxy name of the column containing the muon dxy values
+/// \param[in] dz name of the column containing the muon dz values
+/// \param[in] iso name of the column containing the muon isolations
+/// \param[in] id name of the boolean ID column, e.g. Muon_tightId
+/// \param[in] min_pt minimal pt value, muons must have pt > min_pt
+/// \param[in] max_eta maximal eta value, muons must have |eta| < max_eta
+/// \param[in] max_dxy maximal dxy value, muons must have |dxy| < max_dxy
+/// \param[in] max_dz maximal dz value, muons must have |dz| < max_dz
+/// \param[in] max_iso maximal isolation value, muons must have iso < max_iso
+///
+/// \return a dataframe containing the new mask
+ROOT::RDF::RNode FusedSelection(ROOT::RDF::RNode df,
+                                const std::string &maskname,
+                                const std::string &pt, const std::string &eta,
+                                const std::string &dxy, const std::string &dz,
+                                const std::string &iso, const std::string &id,
+                                const float &min_pt, const float &max_eta,
+                                const float &max_dxy, const float &max_dz,
+                                const float &max_iso) {
+    auto selection = [min_pt, max_eta, max_dxy, max_dz,
+                      max_iso](const ROOT::RVec<float> &pt,
+                               const ROOT::RVec<float> &eta,
+                               const ROOT::RVec<float> &dxy,
+                               const ROOT::RVec<float> &dz,
+                               const ROOT::RVec<float> &iso,
+                               const ROOT::RVec<Bool_t> &id) {
+        ROOT::RVec<int> mask(pt.size());
+        for (std::size_t i = 0; i < pt.size(); ++i) {
+            mask[i] = pt[i] > min_pt && std::abs(eta[i]) < max_eta &&
+                      std::abs(dxy[i]) < max_dxy &&
+                      std::abs(dz[i]) < max_dz && iso[i] < max_iso && id[i];
+        }
+        Logger::get("muon::FusedSelection")->debug("mask {}", mask);
+        return mask;
+    };
+    return df.Define(maskname, selection, {pt, eta, dxy, dz, iso, id});
+}
+} // end namespace muon
+namespace electron {
+/// Function to select electrons with a pt, eta, impact parameter, cut-based
+/// ID and isolation selection in a single loop over the electrons.
+/// Equivalent to combining CutPt, CutEta, CutDxy, CutDz, electron::CutCBID
+/// and electron::CutIsolation, without the intermediate masks.
+///
+/// \param[in] df the input dataframe
+/// \param[out] maskname the name of the new mask to be added as column to
+/// the dataframe
+/// \param[in] pt name of the column containing the electron pts
+/// \param[in] eta name of the column containing the electron etas
+/// \param[in] dxy name of the column containing the electron dxy values
+/// \param[in] dz name of the column containing the electron dz values
+/// \param[in] iso name of the column containing the electron isolations
+/// \param[in] id name of the cut-based ID column, e.g. Electron_cutBased
+/// \param[in] id_wp minimal working point, electrons must have id >= id_wp
+/// \param[in] min_pt minimal pt value, electrons must have pt > min_pt
+/// \param[in] max_eta maximal eta value, electrons must have |eta| < max_eta
+/// \param[in] max_dxy maximal dxy value, electrons must have |dxy| < max_dxy
+/// \param[in] max_dz maximal dz value, electrons must have |dz| < max_dz
+/// \param[in] max_iso maximal isolation value, electrons must have iso <
+/// max_iso
+///
+/// \return a dataframe containing the new mask
+ROOT::RDF::RNode FusedSelection(ROOT::RDF::RNode df,
+                                const std::string &maskname,
+                                const std::string &pt, const std::string &eta,
+                                const std::string &dxy, const std::string &dz,
+                                const std::string &iso, const std::string &id,
+                                const int &id_wp, const float &min_pt,
+                                const float &max_eta, const float &max_dxy,
+                                const float &max_dz, const float &max_iso) {
+    auto selection = [id_wp, min_pt, max_eta, max_dxy, max_dz,
+                      max_iso](const ROOT::RVec<float> &pt,
+                               const ROOT::RVec<float> &eta,
+                               const ROOT::RVec<float> &dxy,
+                               const ROOT::RVec<float> &dz,
+                               const ROOT::RVec<float> &iso,
+                               const ROOT::RVec<int> &id) {
+        ROOT::RVec<int> mask(pt.size());
+        for (std::size_t i = 0; i < pt.size(); ++i) {
+            mask[i] = pt[i] > min_pt && std::abs(eta[i]) < max_eta &&
+                      std::abs(dxy[i]) < max_dxy &&
+                      std::abs(dz[i]) < max_dz && iso[i] < max_iso &&
+                      id[i] >= id_wp;
+        }
+        Logger::get("electron::FusedSelection")->debug("mask {}", mask);
+        return mask;
+    };
+    return df.Define(maskname, selection, {pt, eta, dxy, dz, iso, id});
+}
+} // end namespace electron
+} // end namespace physicsobject
+#endif /* GUARD_LEPTONSELECTION_H */
@@ -0,0 +1,181 @@
+#ifndef GUARD_METADATA_H
+#define GUARD_METADATA_H
+
+#include "ROOT/RDataFrame.hxx"
+#include <fstream>
+#include <iomanip>
+#include <map>
+#include <mutex>
+#include <sstream>
+#include <string>
+#include <utility>
+#include <vector>
+
+namespace metadata {
+/// File level metadata of the outputs of an executable, i.e. values that are
+/// constant for all events and should not be stored per event. The record
+/// is written as json file to the path given by the generated code with
+/// metadata::Open, and rewritten completely on every change. A rerun of the
+/// executable therefore replaces the record of the previous run. Entries
+/// added before the path is set are kept and written with it.
+class Record {
+  public:
+    void SetSampleFlags(const std::vector<std::string> &names,
+                        const std::vector<bool> &values) {
+        std::lock_guard<std::mutex> lock(mutex_);
+        sample_flags_.clear();
+        for (std::size_t i = 0; i < names.size() && i < values.size(); ++i) {
+            sample_flags_.emplace_back(names[i], values[i]);
+        }
+        Write();
+    }
+    void AddCutflowEntry(const std::string &scope, const std::string &shift,
+                         const std::string &entry) {
+        std::lock_guard<std::mutex> lock(mutex_);
+        cutflow_[scope][shift].push_back(entry);
+        Write();
+    }
+    void SetSumOfWeights(const std::string &sumw) {
+        std::lock_guard<std::mutex> lock(mutex_);
+        sumw_ = sumw;
+        Write();
+    }
+    void SetFilename(const std::string &filename) {
+        std::lock_guard<std::mutex> lock(mutex_);
+        filename_ = filename;
+        Write();
+    }
+
+  private:
+    void Write() {
+        if (filename_.empty())
+            return;
+        std::ofstream out(filename_, std::ios::trunc);
+        out << "{\n    \"sample_flags\": {";
+        for (std::size_t i = 0; i < sample_flags_.size(); ++i) {
+            out << (i == 0 ? "" : ", ") << "\"" << sample_flags_[i].first
+                << "\": " << (sample_flags_[i].second ? "true" : "false");
+        }
+        out << "},\n    \"cutflow\": {";
+        bool first_scope = true;
+        for (const auto &scope : cutflow_) {
+            out << (first_scope ? "" : ",") << "\n        \"" << scope.first
+                << "\": {";
+            bool first_shift = true;
+            for (const auto &shift : scope.second) {
+                out << (first_shift ? "" : ",") << "\n            \""
+                    << shift.first << "\": [";
+                for (std::size_t i = 0; i < shift.second.size(); ++i) {
+                    out << (i == 0 ? "" : ",") << "\n                "
+                        << shift.second[i];
+                }
+                out << "\n            ]";
+                first_shift = false;
+            }
+            out << "\n        }";
+            first_scope = false;
+        }
+        out << (cutflow_.empty() ? "" : "\n    ") << "},\n    \"sumw\": "
+            << (sumw_.empty() ? "{}" : sumw_) << "\n}\n";
+    }
+    std::mutex mutex_;
+    std::string filename_;
+    std::vector<std::pair<std::string, bool>> sample_flags_;
+    std::map<std::string, std::map<std::string, std::vector<std::string>>>
+        cutflow_;
+    std::string sumw_;
+};
+
+/// The record of the executable. It is never destroyed, so entries can be
+/// added from destructors running at the end of the program.
+Record &GetRecord() {
+    static auto *record = new Record();
+    return *record;
+}
+
+/// Function to set the path of the metadata record of the executable. It
+/// has to be called by the generated code before any other entry is
+/// expected on disk, usually as first producer of the global scope. The
+/// dataframe is returned unchanged.
+///
+/// \param[in] df the input dataframe
+/// \param[in] filename path of the json file the record is written to
+///
+/// \return the unchanged dataframe
+ROOT::RDF::RNode Open(ROOT::RDF::RNode df, const std::string &filename) {
+    GetRecord().SetFilename(filename);
+    return df;
+}
+/// Function to store the sample flags of the executable in the metadata
+/// record
+///
+/// \param[in] names names of the flags
+/// \param[in] values values of the flags, in the order of names
+void SetSampleFlags(const std::vector<std::string> &names,
+                    const std::vector<bool> &values) {
+    GetRecord().SetSampleFlags(names, values);
+}
+/// Function to add the counts of one filter to the cutflow of the metadata
+/// record. The entries of a scope and shift keep the order they are added
+/// in.
+///
+/// \param[in] scope the scope of the filter, i.e. the output it belongs to
+/// \param[in] shift the shift of the filter, nominal for unshifted filters
+/// \param[in] filtername the name of the filter
+/// \param[in] events number of events seen by the filter
+/// \param[in] passed number of events passing the filter
+/// \param[in] sumw sum of weights of the events seen by the filter
+/// \param[in] sumw_passed sum of weights of the events passing the filter
+void AddCutflowEntry(const std::string &scope, const std::string &shift,
+                     const std::string &filtername,
+                     const unsigned long long events,
+                     const unsigned long long passed, const double sumw,
+                     const double sumw_passed) {
+    std::ostringstream entry;
+    entry << std::setprecision(15) << "{\"filter\": \"" << filtername << "\", \"events\": " << events
+          << ", \"passed\": " << passed << ", \"sumw\": " << sumw
+          << ", \"sumw_passed\": " << sumw_passed << "}";
+    GetRecord().AddCutflowEntry(scope, shift, entry.str());
+}
+/// Function to store the sum of weights of all events entering the
+/// executable in the metadata record. The sum of weights per number of
+/// partons is indexed by the number of partons, the last entry contains all
+/// events with at least as many partons.
+///
+/// \param[in] nevents number of events
+/// \param[in] sumw sum of the generator weights
+/// \param[in] sumw2 sum of the squared generator weights
+/// \param[in] sumw_per_npartons sum of the generator weights per number of
+/// partons
+void SetSumOfWeights(const unsigned long long nevents, const double sumw,
+                     const double sumw2,
+                     const std::vector<double> &sumw_per_npartons) {
+    std::ostringstream record;
+    record << std::setprecision(15) << "{\"nevents\": " << nevents
+           << ", \"sumw\": " << sumw << ", \"sumw2\": " << sumw2
+           << ", \"sumw_per_npartons\": {";
+    for (std::size_t i = 0; i < sumw_per_npartons.size(); ++i) {
+        record << (i == 0 ? "" : ", ") << "\"" << i
+               << "\": " << sumw_per_npartons[i];
+    }
+    record << "}}";
+    GetRecord().SetSumOfWeights(record.str());
+}
+/// Function to store the sample flags of the executable as file level
+/// metadata instead of per event columns. The flags are constant for an
+/// executable, so they are written once when the graph is built. The
+/// dataframe is returned unchanged.
+///
+/// \param[in] df the input dataframe
+/// \param[in] names names of the flags
+/// \param[in] values values of the flags, in the order of names
+///
+/// \return the unchanged dataframe
+ROOT::RDF::RNode SampleFlags(ROOT::RDF::RNode df,
+                             const std::vector<std::string> &names,
+                             const std::vector<bool> &values) {
+    SetSampleFlags(names, values);
+    return df;
+}
+} // end namespace metadata
+#endif /* GUARD_METADATA_H */
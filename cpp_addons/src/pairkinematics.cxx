@@ -0,0 +1,186 @@
+#ifndef GUARD_PAIRKINEMATICS_H
+#define GUARD_PAIRKINEMATICS_H
+
+#include "../../../../include/defaults.hxx"
+#include "../../../../include/utility/Logger.hxx"
+#include "Math/Vector4D.h"
+#include "ROOT/RDataFrame.hxx"
+#include "ROOT/RVec.hxx"
+#include <cmath>
+#include <stdexcept>
+#include <string>
+#include <vector>
+
+namespace quantities {
+/// Transverse mass of two objects, given by their pt and phi.
+inline float TransverseMass(const double &pt_1, const double &phi_1,
+                            const double &pt_2, const double &phi_2) {
+    return std::sqrt(2. * pt_1 * pt_2 * (1. - std::cos(phi_1 - phi_2)));
+}
+/// Add one column per entry of the kinematics column to the dataframe.
+///
+/// \param[in] df the input dataframe
+/// \param[out] outputnames names of the columns, in the order of the entries
+/// \param[in] kinematics name of the column containing all kinematic
+/// quantities
+///
+/// \return a dataframe containing the new columns
+inline ROOT::RDF::RNode
+UnpackKinematics(ROOT::RDF::RNode df,
+                 const std::vector<std::string> &outputnames,
+                 const std::string &kinematics) {
+    for (std::size_t i = 0; i < outputnames.size(); ++i) {
+        df = df.Define(
+            outputnames.at(i),
+            [i](const ROOT::RVec<float> &values) { return values[i]; },
+            {kinematics});
+    }
+    return df;
+}
+/// Function to calculate the kinematic quantities of a single lepton in one
+/// go. The lorentz vector is converted only once and the columns are filled
+/// from a single vector of results.
+///
+/// The quantities are, in the order of the outputnames: pt, eta, phi and
+/// mass of the lepton.
+///
+/// \param[in] df the input dataframe
+/// \param[out] outputnames names of the 4 output columns
+/// \param[in] p4_1 name of the column containing the lepton
+///
+/// \return a dataframe containing the new columns
+ROOT::RDF::RNode LeptonKinematics(ROOT::RDF::RNode df,
+                                  const std::vector<std::string> &outputnames,
+                                  const std::string &p4_1) {
+    if (outputnames.size() != 4) {
+        Logger::get("LeptonKinematics")
+            ->error("Expected 4 output columns, got {}", outputnames.size());
+        throw std::runtime_error("Wrong number of outputs");
+    }
+    auto calculate = [](const ROOT::Math::PtEtaPhiMVector &p4_1) {
+        return ROOT::RVec<float>{(float)p4_1.pt(), (float)p4_1.eta(),
+                                 (float)p4_1.phi(), (float)p4_1.mass()};
+    };
+    auto kinematics = outputnames.at(0) + "_lepton_kinematics";
+    auto df1 = df.Define(kinematics, calculate, {p4_1});
+    return UnpackKinematics(df1, outputnames, kinematics);
+}
+/// Function to calculate all kinematic quantities of a dilepton pair in one
+/// go. Only the two lepton lorentz vectors are read, so the columns are not
+/// recomputed for shifts of the met or the jets.
+///
+/// The quantities are, in the order of the outputnames:
+///   - pt, eta, phi and mass of the first lepton
+///   - pt, eta, phi and mass of the second lepton
+///   - m_vis and pt_vis of the dilepton system, default_float if one of the
+///     leptons is not valid
+///
+/// \param[in] df the input dataframe
+/// \param[out] outputnames names of the 10 output columns
+/// \param[in] p4_1 name of the column containing the first lepton
+/// \param[in] p4_2 name of the column containing the second lepton
+///
+/// \return a dataframe containing the new columns
+ROOT::RDF::RNode DileptonKinematics(ROOT::RDF::RNode df,
+                                    const std::vector<std::string> &outputnames,
+                                    const std::string &p4_1,
+                                    const std::string &p4_2) {
+    if (outputnames.size() != 10) {
+        Logger::get("DileptonKinematics")
+            ->error("Expected 10 output columns, got {}", outputnames.size());
+        throw std::runtime_error("Wrong number of outputs");
+    }
+    auto calculate = [](const ROOT::Math::PtEtaPhiMVector &p4_1,
+                        const ROOT::Math::PtEtaPhiMVector &p4_2) {
+        const bool valid = p4_1.pt() >= 0. && p4_2.pt() >= 0.;
+        const auto dilepton = p4_1 + p4_2;
+        return ROOT::RVec<float>{
+            (float)p4_1.pt(),
+            (float)p4_1.eta(),
+            (float)p4_1.phi(),
+            (float)p4_1.mass(),
+            (float)p4_2.pt(),
+            (float)p4_2.eta(),
+            (float)p4_2.phi(),
+            (float)p4_2.mass(),
+            valid ? (float)dilepton.mass() : default_float,
+            valid ? (float)dilepton.pt() : default_float};
+    };
+    auto kinematics = outputnames.at(0) + "_dilepton_kinematics";
+    auto df1 = df.Define(kinematics, calculate, {p4_1, p4_2});
+    return UnpackKinematics(df1, outputnames, kinematics);
+}
+/// Function to calculate all quantities of a dilepton pair that depend on
+/// the missing transverse energy or the jets in one go.
+///
+/// The quantities are, in the order of the outputnames:
+///   - pzetamissvis = pzetamiss - 0.85 * pzetavis, projected on the bisector
+///     of the two leptons in the transverse plane
+///   - the transverse mass of the dilepton system and the met
+///   - the transverse masses of the first and the second lepton with the met
+///   - pt_tt, the pt of the dilepton system and the met
+///   - pt_ttjj, the pt of the dilepton system, the met and the two leading
+///     jets, default_float if one of the jets is not valid
+///   - mt_tot, the total transverse mass of the two leptons and the met
+///
+/// \param[in] df the input dataframe
+/// \param[out] outputnames names of the 7 output columns
+/// \param[in] p4_1 name of the column containing the first lepton
+/// \param[in] p4_2 name of the column containing the second lepton
+/// \param[in] jet_p4_1 name of the column containing the leading jet
+/// \param[in] jet_p4_2 name of the column containing the subleading jet
+/// \param[in] met name of the column containing the met lorentz vector
+///
+/// \return a dataframe containing the new columns
+ROOT::RDF::RNode
+DileptonMETKinematics(ROOT::RDF::RNode df,
+                      const std::vector<std::string> &outputnames,
+                      const std::string &p4_1, const std::string &p4_2,
+                      const std::string &jet_p4_1,
+                      const std::string &jet_p4_2, const std::string &met) {
+    if (outputnames.size() != 7) {
+        Logger::get("DileptonMETKinematics")
+            ->error("Expected 7 output columns, got {}", outputnames.size());
+        throw std::runtime_error("Wrong number of outputs");
+    }
+    auto calculate = [](const ROOT::Math::PtEtaPhiMVector &p4_1,
+                        const ROOT::Math::PtEtaPhiMVector &p4_2,
+                        const ROOT::Math::PtEtaPhiMVector &jet_p4_1,
+                        const ROOT::Math::PtEtaPhiMVector &jet_p4_2,
+                        const ROOT::Math::PtEtaPhiMVector &met) {
+        const double pt_1 = p4_1.pt();
+        const double phi_1 = p4_1.phi();
+        const double pt_2 = p4_2.pt();
+        const double phi_2 = p4_2.phi();
+        const double met_pt = met.pt();
+        const double met_phi = met.phi();
+        const auto dilepton = p4_1 + p4_2;
+        // bisector of the two leptons in the transverse plane
+        const double zeta_x = std::cos(phi_1) + std::cos(phi_2);
+        const double zeta_y = std::sin(phi_1) + std::sin(phi_2);
+        const double zeta_norm = std::sqrt(zeta_x * zeta_x + zeta_y * zeta_y);
+        const double pzetavis =
+            (dilepton.px() * zeta_x + dilepton.py() * zeta_y) / zeta_norm;
+        const double pzetamiss =
+            (met.px() * zeta_x + met.py() * zeta_y) / zeta_norm;
+        const float mt_1 = TransverseMass(pt_1, phi_1, met_pt, met_phi);
+        const float mt_2 = TransverseMass(pt_2, phi_2, met_pt, met_phi);
+        const float mt_12 = TransverseMass(pt_1, phi_1, pt_2, phi_2);
+        const bool valid_jets = jet_p4_1.pt() >= 0. && jet_p4_2.pt() >= 0.;
+        return ROOT::RVec<float>{
+            (float)(pzetamiss - 0.85 * pzetavis),
+            TransverseMass(dilepton.pt(), dilepton.phi(), met_pt, met_phi),
+            mt_1,
+            mt_2,
+            (float)(dilepton + met).pt(),
+            valid_jets ? (float)(dilepton + jet_p4_1 + jet_p4_2 + met).pt()
+                       : default_float,
+            std::sqrt(mt_1 * mt_1 + mt_2 * mt_2 + mt_12 * mt_12)};
+    };
+    auto kinematics = outputnames.at(0) + "_dileptonmet_kinematics";
+    auto df1 = df.Define(kinematics, calculate,
+                         {p4_1, p4_2, jet_p4_1, jet_p4_2, met});
+    return UnpackKinematics(df1, outputnames, kinematics);
+}
+} // end namespace quantities
+#endif /* GUARD_PAIRKINEMATICS_H */
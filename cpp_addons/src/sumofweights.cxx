@@ -0,0 +1,89 @@
+#ifndef GUARD_SUMOFWEIGHTS_H
+#define GUARD_SUMOFWEIGHTS_H
+
+#include "ROOT/RDataFrame.hxx"
+#include <algorithm>
+#include <memory>
+#include <numeric>
+#include <string>
+#include <vector>
+
+namespace metadata {
+void SetSumOfWeights(const unsigned long long nevents, const double sumw,
+                     const double sumw2,
+                     const std::vector<double> &sumw_per_npartons);
+} // end namespace metadata
+
+namespace sumofweights {
+/// Events with more partons are added to the last entry of the sum of
+/// weights per number of partons
+const unsigned int max_npartons = 4;
+
+/// Per slot accumulators of the number of events, the sum of weights, the
+/// sum of squared weights and the sum of weights per number of partons. The
+/// accumulators are owned by the computation graph, they are merged and
+/// stored in the metadata record when the graph is destroyed after the
+/// event loop.
+class Accumulator {
+  public:
+    explicit Accumulator(const unsigned int nslots)
+        : nevents_(nslots, 0), sumw_(nslots, 0.), sumw2_(nslots, 0.),
+          sumw_per_npartons_(nslots,
+                             std::vector<double>(max_npartons + 1, 0.)) {}
+    void Fill(const unsigned int slot, const double weight,
+              const unsigned int npartons) {
+        nevents_[slot] += 1;
+        sumw_[slot] += weight;
+        sumw2_[slot] += weight * weight;
+        sumw_per_npartons_[slot][std::min(npartons, max_npartons)] += weight;
+    }
+    ~Accumulator() {
+        std::vector<double> sumw_per_npartons(max_npartons + 1, 0.);
+        for (const auto &slot : sumw_per_npartons_) {
+            for (std::size_t i = 0; i < slot.size(); ++i) {
+                sumw_per_npartons[i] += slot[i];
+            }
+        }
+        metadata::SetSumOfWeights(Sum(nevents_), Sum(sumw_), Sum(sumw2_),
+                                  sumw_per_npartons);
+    }
+
+  private:
+    template <typename T> static T Sum(const std::vector<T> &values) {
+        return std::accumulate(values.begin(), values.end(), T(0));
+    }
+    std::vector<unsigned long long> nevents_;
+    std::vector<double> sumw_;
+    std::vector<double> sumw2_;
+    std::vector<std::vector<double>> sumw_per_npartons_;
+};
+
+/// Function to accumulate the sum of generator weights of all events
+/// entering the dataframe. The sums are filled per slot in the event loop
+/// of the executable, no additional pass over the events is needed, and
+/// stored in the metadata record of the output instead of per event
+/// columns. The dataframe is passed through an always true filter, so the
+/// accumulation runs for every event even if no output uses it.
+///
+/// \param[in] df the input dataframe
+/// \param[in] genweight name of the float column containing the generator
+/// weight
+/// \param[in] npartons name of the UChar_t column containing the number of
+/// partons
+///
+/// \return a dataframe containing all events of the input dataframe
+ROOT::RDF::RNode Accumulate(ROOT::RDF::RNode df, const std::string &genweight,
+                            const std::string &npartons) {
+    auto accumulator = std::make_shared<Accumulator>(df.GetNSlots());
+    auto fill = [accumulator](const unsigned int slot, const float weight,
+                              const UChar_t n) {
+        accumulator->Fill(slot, weight, n);
+        return true;
+    };
+    return df.DefineSlot(genweight + "_sumofweights", fill,
+                         {genweight, npartons})
+        .Filter([](const bool pass) { return pass; },
+                {genweight + "_sumofweights"}, "SumOfWeights");
+}
+} // end namespace sumofweights
+#endif /* GUARD_SUMOFWEIGHTS_H */
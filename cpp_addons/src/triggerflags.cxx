@@ -0,0 +1,149 @@
+#ifndef GUARD_TRIGGERFLAGS_H
+#define GUARD_TRIGGERFLAGS_H
+
+#include "../../../../include/utility/Logger.hxx"
+#include "Math/Vector4D.h"
+#include "Math/VectorUtil.h"
+#include "ROOT/RDataFrame.hxx"
+#include "ROOT/RVec.hxx"
+#include <algorithm>
+#include <cmath>
+#include <stdexcept>
+#include <string>
+#include <vector>
+
+namespace trigger {
+/// Function to define the HLT paths missing in the input as false, so that
+/// the decisions of all paths can be read as typed columns. A missing path is
+/// reported once when the graph is built.
+///
+/// \param[in] df the input dataframe
+/// \param[in] hlt_paths names of the HLT path branches
+///
+/// \return a dataframe containing all paths
+ROOT::RDF::RNode DefineMissingPaths(ROOT::RDF::RNode df,
+                                    const std::vector<std::string> &hlt_paths) {
+    const auto columns = df.GetColumnNames();
+    for (const auto &path : hlt_paths) {
+        if (std::find(columns.begin(), columns.end(), path) != columns.end())
+            continue;
+        Logger::get("HLTDecisions")
+            ->warn("{} not found in the input, setting it to false", path);
+        df = df.Define(path, []() { return false; });
+    }
+    return df;
+}
+/// Function to evaluate a set of trigger selections for one particle in a
+/// single pass. A selection is fulfilled if its HLT path fired and a trigger
+/// object with the given id and filter bit is found within
+/// max_deltaR_triggermatch of the particle, and the particle passes the pt
+/// and eta cuts, as in trigger::GenerateSingleTriggerFlag. A cut value of -1
+/// disables the cut. The selections are given as parallel vectors, one entry
+/// per selection.
+///
+/// \param[in] df the input dataframe
+/// \param[out] outputname name of the new column, containing one flag per
+/// selection
+/// \param[in] decisions name of the column containing the HLT decisions, as
+/// written by trigger::HLTDecisions
+/// \param[in] particle_p4 name of the column containing the particle
+/// \param[in] triggerobject_bits name of the column containing the filter
+/// bits of the trigger objects
+/// \param[in] triggerobject_id name of the column containing the ids of the
+/// trigger objects
+/// \param[in] triggerobject_pt name of the column containing the trigger
+/// object pts
+/// \param[in] triggerobject_eta name of the column containing the trigger
+/// object etas
+/// \param[in] triggerobject_phi name of the column containing the trigger
+/// object phis
+/// \param[in] path_index index of the HLT path in the decisions column
+/// \param[in] ptcut minimal pt of the particle
+/// \param[in] etacut maximal absolute eta of the particle
+/// \param[in] trigger_particle_id id of the matched trigger object
+/// \param[in] filterbit filter bit the matched trigger object has to have
+/// \param[in] max_deltaR_triggermatch maximal deltaR between the particle
+/// and the trigger object
+///
+/// \return a dataframe containing the new column
+ROOT::RDF::RNode MatchTriggerSelections(
+    ROOT::RDF::RNode df, const std::string &outputname,
+    const std::string &decisions, const std::string &particle_p4,
+    const std::string &triggerobject_bits, const std::string &triggerobject_id,
+    const std::string &triggerobject_pt, const std::string &triggerobject_eta,
+    const std::string &triggerobject_phi, const std::vector<int> &path_index,
+    const std::vector<float> &ptcut, const std::vector<float> &etacut,
+    const std::vector<int> &trigger_particle_id,
+    const std::vector<int> &filterbit,
+    const std::vector<float> &max_deltaR_triggermatch) {
+    const std::size_t n_selections = path_index.size();
+    if (ptcut.size() != n_selections || etacut.size() != n_selections ||
+        trigger_particle_id.size() != n_selections ||
+        filterbit.size() != n_selections ||
+        max_deltaR_triggermatch.size() != n_selections) {
+        Logger::get("MatchTriggerSelections")
+            ->error("Trigger selections of {} have different lengths",
+                    outputname);
+        throw std::runtime_error("Inconsistent trigger selections");
+    }
+    auto match = [=](const ROOT::RVec<int> &decisions,
+                     const ROOT::Math::PtEtaPhiMVector &particle,
+                     const ROOT::RVec<int> &bits, const ROOT::RVec<int> &ids,
+                     const ROOT::RVec<float> &pts,
+                     const ROOT::RVec<float> &etas,
+                     const ROOT::RVec<float> &phis) {
+        ROOT::RVec<int> flags(n_selections, 0);
+        // default particles are not matched
+        if (particle.pt() < 0.)
+            return flags;
+        for (std::size_t i = 0; i < n_selections; ++i) {
+            if (!decisions[path_index[i]])
+                continue;
+            if ((ptcut[i] != -1 && particle.pt() <= ptcut[i]) ||
+                (etacut[i] != -1 && std::abs(particle.eta()) >= etacut[i]))
+                continue;
+            for (std::size_t j = 0; j < ids.size(); ++j) {
+                if (ids[j] != trigger_particle_id[i])
+                    continue;
+                if (filterbit[i] != -1 && !(bits[j] & (1 << filterbit[i])))
+                    continue;
+                const ROOT::Math::PtEtaPhiMVector triggerobject(
+                    pts[j], etas[j], phis[j], particle.mass());
+                if (ROOT::Math::VectorUtil::DeltaR(triggerobject, particle) <
+                    max_deltaR_triggermatch[i]) {
+                    flags[i] = 1;
+                    break;
+                }
+            }
+        }
+        Logger::get("MatchTriggerSelections")->debug("flags {}", flags);
+        return flags;
+    };
+    return df.Define(outputname, match,
+                     {decisions, particle_p4, triggerobject_bits,
+                      triggerobject_id, triggerobject_pt, triggerobject_eta,
+                      triggerobject_phi});
+}
+/// Function to add one trigger flag, taken from the flags of all trigger
+/// selections, to the dataframe.
+///
+/// \param[in] df the input dataframe
+/// \param[out] outputname name of the new flag column
+/// \param[in] matches name of the column containing the flags of all
+/// selections, as written by trigger::MatchTriggerSelections
+/// \param[in] selection_index index of the selection of this flag
+///
+/// \return a dataframe containing the new column
+ROOT::RDF::RNode UnpackTriggerFlag(ROOT::RDF::RNode df,
+                                   const std::string &outputname,
+                                   const std::string &matches,
+                                   const int &selection_index) {
+    return df.Define(
+        outputname,
+        [selection_index](const ROOT::RVec<int> &flags) {
+            return static_cast<bool>(flags[selection_index]);
+        },
+        {matches});
+}
+} // end namespace trigger
+#endif /* GUARD_TRIGGERFLAGS_H */
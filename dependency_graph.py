@@ -0,0 +1,246 @@
+from __future__ import annotations  # needed for type annotations in > python 3.7
+
+import hashlib
+import json
+import logging
+import re
+import time
+from typing import Dict, List, Set
+
+from code_generation.producer import ProducerGroup
+from code_generation.quantity import NanoAODQuantity
+
+
+def analysis_scopes(configuration) -> List[str]:
+    """Return all scopes of the configuration, starting with the global scope."""
+    return [configuration.global_scope] + [
+        scope for scope in configuration.scopes if scope != configuration.global_scope
+    ]
+
+
+def leaf_producers(producer, scope: str) -> List:
+    """
+    Unpack a (possibly nested) producer group into the producers that issue calls.
+    The call of a group, e.g. of a filter, consumes the outputs of its subproducers,
+    so it follows them.
+    """
+    if not isinstance(producer, ProducerGroup):
+        return [producer]
+    leafs = []
+    for subproducer in producer.producers[scope]:
+        leafs.extend(leaf_producers(subproducer, scope))
+    if producer.call is not None:
+        leafs.append(producer)
+    return leafs
+
+
+def scope_producers(configuration, scope: str) -> List:
+    """Return all producers of a scope that issue calls, in execution order."""
+    producers = []
+    for producer in configuration.producers.get(scope, []):
+        producers.extend(leaf_producers(producer, scope))
+    return producers
+
+
+# index literal directly following the inputs of a call, e.g. "lorentzvectors::build({df}, {input_vec}, 1, {output})"
+INDEX_ARGUMENT = re.compile(r"\{input(?:_vec)?\},\s*(\d+)\s*[,)]")
+# calls consuming an index collection without depending on its order
+ORDER_INDEPENDENT_CALLS = ("quantities::jet::NumberOfJets",)
+
+
+def leading_entries_consumed(configuration, scope: str, quantity) -> int:
+    """
+    Return how many leading entries of an ordered index collection the producers of a
+    scope consume, taken from the index literals in their calls. Returns -1 if a
+    producer might depend on the order of the whole collection.
+    """
+    n_leading = 0
+    for producer in scope_producers(configuration, scope):
+        if quantity not in (producer.get_inputs(scope) or []):
+            continue
+        if producer.call.startswith(ORDER_INDEPENDENT_CALLS):
+            continue
+        index = INDEX_ARGUMENT.search(producer.call)
+        if index is None:
+            return -1
+        n_leading = max(n_leading, int(index.group(1)) + 1)
+    return n_leading
+
+
+def check_leading_entries(configuration, parameter: str, quantity) -> None:
+    """
+    Check that the number of leading entries of an ordered index collection given
+    by a parameter covers the entries consumed by the final producers of every
+    scope. Has to be called after configuration.optimize(), when all rules are
+    applied.
+    """
+    for scope in analysis_scopes(configuration):
+        if scope == configuration.global_scope:
+            continue
+        n_leading = scope_parameter(configuration, scope, parameter)
+        if n_leading is None or n_leading < 0:
+            continue
+        consumed = leading_entries_consumed(configuration, scope, quantity)
+        if consumed < 0 or consumed > n_leading:
+            raise ValueError(
+                f"{scope}: {parameter} = {n_leading}, but the producers consume "
+                + (
+                    f"the order of all entries of {quantity.name}"
+                    if consumed < 0
+                    else f"{consumed} entries of {quantity.name}"
+                )
+            )
+
+
+def producer_shifts(producer, scope: str) -> Set[str]:
+    """Return the shifts for which the producer is run in addition to the nominal."""
+    shifts = set()
+    for output in producer.get_outputs(scope) or []:
+        shifts.update(output.get_shifts(scope))
+    return shifts
+
+
+def shift_name(shift: str) -> str:
+    """Strip the output suffix separator from a shift, e.g. "__jerUncUp" -> "jerUncUp"."""
+    return shift.lstrip("_")
+
+
+def producer_runs(configuration) -> Dict[str, Dict[str, int]]:
+    """
+    Count the producer calls per scope and shift, the nominal included.
+    Shifted calls are the ones the framework propagated through the
+    dependency graph, so a shift in the global scope is also counted
+    for all producers depending on it in the analysis scopes.
+    """
+    runs: Dict[str, Dict[str, int]] = {}
+    for scope in analysis_scopes(configuration):
+        scope_runs = runs.setdefault(scope, {"nominal": 0})
+        for producer in scope_producers(configuration, scope):
+            scope_runs["nominal"] += 1
+            for shift in producer_shifts(producer, scope):
+                name = shift_name(shift)
+                scope_runs[name] = scope_runs.get(name, 0) + 1
+    return runs
+
+
+# placeholders filled by the code generation instead of configuration parameters
+CALL_PLACEHOLDERS = {"df", "input", "output", "input_vec", "output_vec", "vec_open", "vec_close"}
+CALL_PARAMETER = re.compile(r"\{(\w+)\}")
+
+
+def scope_parameter(configuration, scope: str, name: str):
+    if name in configuration.config_parameters.get(scope, {}):
+        return configuration.config_parameters[scope][name]
+    return configuration.config_parameters[configuration.global_scope].get(name)
+
+
+def configuration_fingerprint(configuration) -> str:
+    """
+    Hash everything of an expanded configuration that ends up in the generated code:
+    the calls of all producers with the values of the parameters they use, their
+    inputs, outputs and shifts, and the outputs of every scope. Parameters not used
+    by any call, like the flags of other sample types, do not contribute, so
+    configurations of different samples resulting in the same executable have the
+    same fingerprint.
+    """
+    content = {}
+    for scope in analysis_scopes(configuration):
+        calls = []
+        for producer in scope_producers(configuration, scope):
+            parameters = {
+                name: scope_parameter(configuration, scope, name)
+                for name in CALL_PARAMETER.findall(producer.call)
+                if name not in CALL_PLACEHOLDERS
+            }
+            calls.append(
+                [
+                    producer.call,
+                    parameters,
+                    [quantity.name for quantity in producer.get_inputs(scope) or []],
+                    [quantity.name for quantity in producer.get_outputs(scope) or []],
+                    sorted(producer_shifts(producer, scope)),
+                ]
+            )
+        outputs = sorted(
+            quantity.name for quantity in configuration.outputs.get(scope, [])
+        )
+        content[scope] = {"calls": calls, "outputs": outputs}
+    serialized = json.dumps(content, sort_keys=True, default=str)
+    return hashlib.sha256(serialized.encode()).hexdigest()
+
+
+def quantity_names(quantity, scope: str, shifts) -> Set[str]:
+    """Return the column names of a quantity, nominal and for the given shifts."""
+    names = {quantity.name}
+    names.update(quantity.get_leaf(shift, scope) for shift in shifts)
+    return names
+
+
+def call_parameters(configuration, producer, scope: str) -> Set[str]:
+    """
+    Return the configuration parameters used in the call of a producer. The
+    placeholders of an extended vector producer are the keys of its entries.
+    """
+    names = set(CALL_PARAMETER.findall(producer.call)) - CALL_PLACEHOLDERS
+    if getattr(producer, "vec_config", None):
+        entries = scope_parameter(configuration, scope, producer.vec_config) or []
+        names -= {key for entry in entries for key in entry}
+    return names
+
+
+def configuration_errors(configuration) -> List[str]:
+    """
+    Check the expanded configuration in one pass over the producers in execution
+    order. The quantities produced so far are kept in an index of column names,
+    shifted names included, so every input, nominal and shifted, is resolved with
+    a single lookup and has to be produced upstream: earlier in the same scope or
+    in the global scope, which runs before all other scopes. NanoAOD quantities
+    are assumed to be present in the input files. In addition, every parameter
+    used in a call has to be set and every output has to be produced.
+    """
+    errors = []
+    global_quantities: Set[str] = set()
+    for scope in analysis_scopes(configuration):
+        is_global = scope == configuration.global_scope
+        produced = global_quantities if is_global else set(global_quantities)
+        for producer in scope_producers(configuration, scope):
+            shifts = producer_shifts(producer, scope)
+            for quantity in producer.get_inputs(scope) or []:
+                if isinstance(quantity, NanoAODQuantity):
+                    continue
+                for name in sorted(quantity_names(quantity, scope, shifts)):
+                    if name not in produced:
+                        errors.append(
+                            f"{scope}: {name} needed by {producer.name} is not produced upstream"
+                        )
+            for name in sorted(call_parameters(configuration, producer, scope)):
+                if scope_parameter(configuration, scope, name) is None:
+                    errors.append(
+                        f"{scope}: parameter {name} needed by {producer.name} is not set"
+                    )
+            for output in producer.get_outputs(scope) or []:
+                produced.update(quantity_names(output, scope, output.get_shifts(scope)))
+        for quantity in configuration.outputs.get(scope, []):
+            if isinstance(quantity, NanoAODQuantity):
+                continue
+            if quantity.name not in produced:
+                errors.append(f"{scope}: output {quantity.name} is not produced")
+    return errors
+
+
+def validate_configuration(configuration) -> None:
+    """
+    Validate the expanded configuration with configuration.validate() and, in
+    addition, with the indexed check of the producer order, the parameters and
+    the outputs. All errors of the indexed check are reported at once and the
+    time taken is logged.
+    """
+    root = logging.getLogger()
+    configuration.validate()
+    start = time.perf_counter()
+    errors = configuration_errors(configuration)
+    root.info(f"Indexed validation took {time.perf_counter() - start:.2f} s")
+    if errors:
+        for error in errors:
+            root.error(error)
+        raise ValueError(f"Invalid configuration, {len(errors)} errors found")
@@ -1,11 +1,330 @@
-from os import path, makedirs
+from os import path, makedirs, replace, walk
+import argparse
+import hashlib
 import importlib
+import json
 import logging
 import logging.handlers
+import multiprocessing
+import traceback
 from code_generation.code_generation import CodeGenerator
+from .buildcache import restore_unchanged_mtimes, snapshot_sources
+from .codereport import check_code_budget, code_report, log_code_report
+from .dependency_graph import configuration_fingerprint
+from .jobsplitting import partition_shifts, shift_costs
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Register the command line options of the analysis. The framework parser can
+    call this function, options it does not know are parsed from the command line
+    by analysis_arguments.
+    """
+    parser.add_argument(
+        "--shift-budget",
+        type=int,
+        default=None,
+        help="maximal number of producer calls per executable, the shifts are "
+        "split into several executables if the budget is exceeded",
+    )
+    parser.add_argument(
+        "--call-budget",
+        type=int,
+        default=None,
+        help="maximal number of producer calls of an executable, the generation "
+        "fails if the generated code exceeds it",
+    )
+    parser.add_argument(
+        "--source-budget",
+        type=int,
+        default=None,
+        help="maximal size of the generated sources of an executable in bytes, the "
+        "generation fails if the generated code exceeds it",
+    )
+    parser.add_argument(
+        "--split-scopes",
+        action="store_true",
+        help="generate one executable per scope, so that the outputs of the scopes "
+        "are written by separate processes",
+    )
+    parser.add_argument(
+        "--share-executables",
+        action="store_true",
+        help="samples with the same expanded configuration as another sample use "
+        "its executable, the mapping is stored in the samplemap of the output folder",
+    )
+
+
+def analysis_arguments(args, argv=None):
+    """
+    Add the analysis options to the arguments parsed by the framework. Options
+    missing there are parsed from argv, by default the command line.
+    """
+    parser = argparse.ArgumentParser(add_help=False)
+    add_arguments(parser)
+    options, _ = parser.parse_known_args(argv)
+    for name, value in vars(options).items():
+        if getattr(args, name, None) is None:
+            setattr(args, name, value)
+    return args
+
+
+def _send_result(sender, function, arguments):
+    try:
+        sender.send((True, function(*arguments)))
+    except Exception:
+        sender.send((False, traceback.format_exc()))
+    finally:
+        sender.close()
+
+
+def run_isolated(function, *arguments):
+    """
+    Run function in a forked process and return its result. Building a
+    configuration modifies the producer and quantity objects of the analysis,
+    so every configuration built within one generation run needs a pristine copy.
+    """
+    context = multiprocessing.get_context("fork")
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(
+        target=_send_result, args=(sender, function, arguments)
+    )
+    process.start()
+    sender.close()
+    try:
+        success, result = receiver.recv()
+    except EOFError:
+        success, result = False, "process terminated without a result"
+    process.join()
+    if not success:
+        raise RuntimeError(f"Isolated call of {function.__name__} failed:\n{result}")
+    return result
+
+
+def estimate_shift_costs(config, era, sample_group, scopes, shifts, available):
+    configuration = config.build_config(era, sample_group, scopes, shifts, *available)
+    return shift_costs(configuration)
+
+
+def sample_fingerprint(config, era, sample_group, scopes, shifts, available):
+    configuration = config.build_config(era, sample_group, scopes, shifts, *available)
+    return configuration_fingerprint(configuration)
+
+
+def configuration_source_hash(config):
+    """
+    Hash the python sources of the analysis configuration, i.e. the config
+    module and all producers, quantities and setup modules next to it.
+    """
+    digest = hashlib.sha256()
+    folder = path.dirname(path.abspath(config.__file__))
+    for directory, _, filenames in sorted(walk(folder)):
+        for filename in sorted(filenames):
+            if not filename.endswith(".py"):
+                continue
+            filepath = path.join(directory, filename)
+            digest.update(path.relpath(filepath, folder).encode())
+            with open(filepath, "rb") as f:
+                digest.update(f.read())
+    return digest.hexdigest()
+
+
+def equivalent_samples(output, config, configname, era, scopes, shifts, available):
+    """
+    Map every available sample to the first sample with an identical expanded
+    configuration, so that samples differing only in unused parameters share one
+    executable. The mapping is stored in the output folder and reused as long as
+    scopes, shifts, the available samples and the configuration sources do not
+    change.
+    """
+    samplemap_file = path.join(output, f"{configname}_{era}_samplemap.json")
+    key = {
+        "scopes": sorted(scopes),
+        "shifts": sorted(shifts),
+        "samples": list(available[0]),
+        "sources": configuration_source_hash(config),
+    }
+    if path.exists(samplemap_file):
+        with open(samplemap_file, "r") as f:
+            stored = json.load(f)
+        if stored["key"] == key:
+            return stored["samples"]
+    representatives = {}
+    samples = {}
+    for sample in available[0]:
+        fingerprint = run_isolated(
+            sample_fingerprint, config, era, sample, scopes, shifts, available
+        )
+        samples[sample] = representatives.setdefault(fingerprint, sample)
+    # the job tooling resolves the executable of a sample by its name
+    executables = {
+        f"{configname}_{sample}_{era}": f"{configname}_{representative}_{era}"
+        for sample, representative in samples.items()
+    }
+    if not path.exists(output):
+        makedirs(output)
+    # several generation runs can share the output folder, write to a temporary
+    # file first, so that a concurrent run never reads a truncated map
+    with open(f"{samplemap_file}.tmp", "w") as f:
+        json.dump(
+            {"key": key, "samples": samples, "executables": executables}, f, indent=4
+        )
+    replace(f"{samplemap_file}.tmp", samplemap_file)
+    return samples
+
+
+def generate_executable(
+    args,
+    config,
+    configname,
+    analysis_name,
+    executable_name,
+    era,
+    sample_group,
+    scopes,
+    shifts,
+    available,
+):
+    root = logging.getLogger()
+    root.info(f"Generating code for {executable_name}...")
+    root.info(f"Shifts: {shifts}")
+    configuration = config.build_config(
+        era,
+        sample_group,
+        scopes,
+        shifts,
+        *available,
+    )
+    # create a CodeGenerator object
+    generator = CodeGenerator(
+        main_template_path=args.template,
+        sub_template_path=args.subset_template,
+        configuration=configuration,
+        executable_name=executable_name,
+        analysis_name=f"{analysis_name}_{configname}",
+        output_folder=args.output,
+        threads=args.threads,
+    )
+    if args.debug == "true":
+        generator.debug = True
+    # generate the code, files identical to the previous generation keep their
+    # modification time, so that only changed files are recompiled
+    sources = path.join(args.output, executable_name)
+    snapshot = snapshot_sources(sources)
+    generator.generate_code()
+    restore_unchanged_mtimes(sources, snapshot)
+    # report the size of the generated code and fail if it exceeds the budget
+    report = code_report(configuration, sources)
+    log_code_report(report)
+    with open(path.join(args.output, f"{executable_name}_codereport.json"), "w") as f:
+        json.dump(report, f, indent=4)
+    check_code_budget(report, args.call_budget, args.source_budget)
+
+    return generator.get_cmake_path()
+
+
+def in_filelist(output, executable_name):
+    """Check if an executable was already added to the files.txt file."""
+    if not path.exists(path.join(output, "files.txt")):
+        return False
+    with open(path.join(output, "files.txt"), "r") as f:
+        return any(executable_name in line for line in f)
+
+
+def add_to_filelist(output, executable):
+    # append the executable name to the files.txt file
+    # if the file does not exist, create it
+    if not path.exists(path.join(output, "files.txt")):
+        with open(path.join(output, "files.txt"), "w") as f:
+            f.write(f"{executable}\n")
+    else:
+        with open(path.join(output, "files.txt"), "r+") as f:
+            for line in f:
+                if executable in line:
+                    break
+            else:
+                f.write(f"{executable}\n")
+
+
+def generate_shift_groups(
+    args,
+    config,
+    configname,
+    analysis_name,
+    executable_name,
+    era,
+    sample_group,
+    scopes,
+    shifts,
+    available,
+    isolated=False,
+):
+    """
+    Generate the executable of a set of scopes, split into several executables
+    by shift groups if the shift budget is exceeded.
+    """
+    root = logging.getLogger()
+    # maximal number of producer calls per executable, shifts are split into
+    # several executables if the budget is exceeded
+    shift_budget = args.shift_budget
+    if shift_budget is None:
+        arguments = (
+            args,
+            config,
+            configname,
+            analysis_name,
+            executable_name,
+            era,
+            sample_group,
+            scopes,
+            shifts,
+            available,
+        )
+        # building a configuration modifies the producers, several executables
+        # generated in one run need isolated builds
+        if isolated:
+            executable = run_isolated(generate_executable, *arguments)
+        else:
+            executable = generate_executable(*arguments)
+        add_to_filelist(args.output, executable)
+        return
+
+    nominal_cost, costs = run_isolated(
+        estimate_shift_costs, config, era, sample_group, scopes, shifts, available
+    )
+    shift_groups = partition_shifts(nominal_cost, costs, shift_budget)
+    if not shift_groups:
+        shift_groups = [sorted(shifts)]
+    root.info(
+        f"Splitting {len(costs)} shifts with a budget of {shift_budget} producer calls "
+        f"(nominal: {nominal_cost}) into {len(shift_groups)} executables"
+    )
+    partition = {}
+    for index, group in enumerate(shift_groups):
+        group_name = f"{executable_name}_{index}"
+        group_cost = nominal_cost + sum(costs.get(shift, 0) for shift in group)
+        root.info(f"{group_name}: {len(group)} shifts, estimated cost {group_cost}")
+        executable = run_isolated(
+            generate_executable,
+            args,
+            config,
+            configname,
+            analysis_name,
+            group_name,
+            era,
+            sample_group,
+            scopes,
+            set(shift.lower() for shift in group),
+            available,
+        )
+        add_to_filelist(args.output, executable)
+        partition[group_name] = {"estimated_cost": group_cost, "shifts": group}
+    with open(path.join(args.output, f"{executable_name}_shiftgroups.json"), "w") as f:
+        json.dump(partition, f, indent=4)
 
 
 def run(args):
+    args = analysis_arguments(args)
 
     analysis_name = "earlyrun3"
 
@@ -34,6 +353,9 @@ def run(args):
     sample_group = args.sample
     era = args.era
     scopes = list(set([scope.lower() for scope in args.scopes]))
+    # samples resulting in the same executable as another sample are not generated
+    # again, the sample map in the output folder points them to the shared executable
+    share_executables = args.share_executables
 
     ## Setup Logging
     root = logging.getLogger()
@@ -58,46 +380,50 @@ def run(args):
         f"analysis_configurations.{analysis_name}.{configname}"
     )
     ## Setting up executable
-    executable = f"{configname}_{sample_group}_{era}.cxx"
+    executable_name = f"{configname}_{sample_group}_{era}"
+    available = (available_samples, available_eras, available_scopes)
     root.info(f"Generating code for {sample_group}...")
     root.info(f"Configuration used: {config}")
     root.info(f"Era: {era}")
     root.info(f"Shifts: {shifts}")
-    config = config.build_config(
-        era,
-        sample_group,
-        scopes,
-        shifts,
-        available_samples,
-        available_eras,
-        available_scopes,
-    )
-    # create a CodeGenerator object
-    generator = CodeGenerator(
-        main_template_path=args.template,
-        sub_template_path=args.subset_template,
-        configuration=config,
-        executable_name=f"{configname}_{sample_group}_{era}",
-        analysis_name=f"{analysis_name}_{configname}",
-        output_folder=args.output,
-        threads=args.threads,
-    )
-    if args.debug == "true":
-        generator.debug = True
-    # generate the code
-    generator.generate_code()
 
-    executable = generator.get_cmake_path()
+    if share_executables:
+        samples = equivalent_samples(
+            args.output, config, configname, era, scopes, shifts, available
+        )
+        representative = samples.get(sample_group, sample_group)
+        if representative != sample_group:
+            shared_name = f"{configname}_{representative}_{era}"
+            if in_filelist(args.output, shared_name):
+                root.info(
+                    f"{sample_group} uses the executable {shared_name}, skipping generation"
+                )
+                return
+            # the representative is not part of this production, its executable
+            # is generated instead, so that the sample can still be processed
+            root.info(f"{sample_group} uses the executable {shared_name}, generating it")
+            sample_group = representative
+            executable_name = shared_name
 
-    # append the executable name to the files.txt file
-    # if the file does not exist, create it
-    if not path.exists(path.join(args.output, "files.txt")):
-        with open(path.join(args.output, "files.txt"), "w") as f:
-            f.write(f"{executable}\n")
+    # the outputs of all scopes are written by the event loop of one executable,
+    # with split scopes every scope gets its own executable and output writer
+    if args.split_scopes:
+        scope_groups = {
+            f"{executable_name}_{scope}": [scope] for scope in sorted(scopes)
+        }
     else:
-        with open(path.join(args.output, "files.txt"), "r+") as f:
-            for line in f:
-                if executable in line:
-                    break
-            else:
-                f.write(f"{executable}\n")
+        scope_groups = {executable_name: scopes}
+    for group_executable_name, group_scopes in scope_groups.items():
+        generate_shift_groups(
+            args,
+            config,
+            configname,
+            analysis_name,
+            group_executable_name,
+            era,
+            sample_group,
+            group_scopes,
+            shifts,
+            available,
+            isolated=len(scope_groups) > 1,
+        )
@@ -0,0 +1,75 @@
+from __future__ import annotations  # needed for type annotations in > python 3.7
+
+import argparse
+import json
+import logging
+import os
+from typing import Dict, List
+
+try:
+    from .jobsplitting import balanced_partition
+except ImportError:
+    # run as a script next to jobsplitting.py, outside of the analysis package
+    from jobsplitting import balanced_partition
+
+
+def count_entries(filenames: List[str], tree: str) -> Dict[str, int]:
+    """
+    Count the entries of every input file. Without ROOT, the file size is used
+    as the cost, which is only comparable between files of the same sample.
+    """
+    try:
+        import ROOT
+    except ImportError:
+        logging.warning("ROOT is not available, balancing by file size")
+        return {filename: os.path.getsize(filename) for filename in filenames}
+    entries = {}
+    for filename in filenames:
+        infile = ROOT.TFile.Open(filename)
+        entries[filename] = infile.Get(tree).GetEntries()
+        infile.Close()
+    return entries
+
+
+def partition_inputs(entries: Dict[str, int], n_jobs: int) -> List[List[str]]:
+    """
+    Distribute the input files over n_jobs with balanced numbers of entries.
+    Within a job the files are ordered by decreasing entries: the implicit
+    multithreading of RDataFrame hands out the clusters as tasks to idle threads
+    in input order, so the large files are processed first and the end of the
+    event loop consists of small tasks that keep all threads busy.
+    """
+    jobs = balanced_partition(entries, min(n_jobs, len(entries)))
+    return [
+        sorted(job, key=lambda filename: (-entries[filename], filename)) for job in jobs
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Split input files into jobs with balanced numbers of entries."
+    )
+    parser.add_argument("--input", nargs="+", required=True, help="input nanoAOD files")
+    parser.add_argument("--jobs", type=int, required=True, help="number of jobs")
+    parser.add_argument("--tree", default="Events")
+    parser.add_argument("--output", required=True, help="output json file")
+    args = parser.parse_args()
+    logging.basicConfig(level="INFO")
+
+    entries = count_entries(args.input, args.tree)
+    jobs = partition_inputs(entries, args.jobs)
+    loads = [sum(entries[filename] for filename in job) for job in jobs]
+    logging.info(
+        f"Split {len(entries)} files into {len(jobs)} jobs, "
+        f"load between {min(loads)} and {max(loads)}"
+    )
+    with open(args.output, "w") as f:
+        json.dump(
+            [{"inputs": job, "entries": load} for job, load in zip(jobs, loads)],
+            f,
+            indent=4,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+from __future__ import annotations  # needed for type annotations in > python 3.7
+
+import math
+from typing import Dict, List, Tuple
+
+
+def shift_costs(configuration) -> Tuple[int, Dict[str, int]]:
+    """
+    Estimate the cost of the nominal and of every shift of an expanded
+    configuration as the number of producer calls they add to the executable.
+    """
+    # imported here, the partitioning is also used by the job tooling without the framework
+    from .dependency_graph import producer_runs
+
+    nominal = 0
+    costs: Dict[str, int] = {}
+    for scope_runs in producer_runs(configuration).values():
+        for shift, runs in scope_runs.items():
+            if shift == "nominal":
+                nominal += runs
+            else:
+                costs[shift] = costs.get(shift, 0) + runs
+    return nominal, costs
+
+
+def balanced_partition(costs: Dict[str, int], n_groups: int) -> List[List[str]]:
+    """Distribute the items over n_groups, always filling the cheapest group (LPT)."""
+    groups: List[List[str]] = [[] for _ in range(n_groups)]
+    loads = [0] * n_groups
+    for item, cost in sorted(costs.items(), key=lambda x: (-x[1], x[0])):
+        cheapest = loads.index(min(loads))
+        groups[cheapest].append(item)
+        loads[cheapest] += cost
+    return [sorted(group) for group in groups if group]
+
+
+def partition_shifts(
+    nominal: int, costs: Dict[str, int], budget: int
+) -> List[List[str]]:
+    """
+    Split the shifts into as few groups as possible, so that the nominal plus
+    the shifts of each group stay within the budget. Every executable runs the
+    nominal as well, so the budget has to be larger than the nominal cost.
+    A single shift exceeding the budget on its own ends up in its own group,
+    the remaining shifts are balanced over the other groups.
+    """
+    if not costs:
+        return []
+    if budget <= nominal:
+        raise ValueError(
+            f"Shift budget {budget} does not cover the nominal cost of {nominal} producer calls"
+        )
+    available = budget - nominal
+    oversized = sorted(
+        (shift for shift, cost in costs.items() if cost > available),
+        key=lambda shift: (-costs[shift], shift),
+    )
+    fitting = {shift: cost for shift, cost in costs.items() if cost <= available}
+    groups = [[shift] for shift in oversized]
+    if not fitting:
+        return groups
+    n_groups = max(1, math.ceil(sum(fitting.values()) / available))
+    while True:
+        partition = balanced_partition(fitting, n_groups)
+        heaviest = max(sum(fitting[shift] for shift in group) for group in partition)
+        # with one shift per group every group fits, so the loop terminates
+        if heaviest <= available:
+            return groups + partition
+        n_groups += 1
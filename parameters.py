@@ -0,0 +1,63 @@
+from __future__ import annotations  # needed for type annotations in > python 3.7
+
+import copy
+from typing import Any, Dict, Hashable, Tuple
+
+from code_generation.configuration import Configuration
+from code_generation.modifiers import EraModifier, SampleModifier
+
+# resolved modifier values per (era, sample), shared by all configurations built in
+# one process, the modifiers are identified by their content
+_RESOLVED: Dict[Tuple[str, str], Dict[Hashable, Any]] = {}
+
+
+def modifier_key(value) -> Hashable:
+    """Return a hashable representation of a parameter value, modifiers included."""
+    if isinstance(value, (EraModifier, SampleModifier)):
+        return (type(value).__name__, modifier_key(vars(value)))
+    if isinstance(value, dict):
+        return ("dict", tuple((key, modifier_key(entry)) for key, entry in value.items()))
+    if isinstance(value, (list, tuple)):
+        return ("list", tuple(modifier_key(entry) for entry in value))
+    return value
+
+
+def resolve_parameters(value, era: str, sample: str):
+    """
+    Resolve the EraModifier and SampleModifier values of a parameter for an era
+    and sample, modifiers nested in lists, dicts or other modifiers included. Every
+    modifier is resolved once per era and sample, the cached value is copied, so
+    the cache cannot be changed through a configuration.
+    """
+    if isinstance(value, (EraModifier, SampleModifier)):
+        resolved = _RESOLVED.setdefault((era, sample), {})
+        key = modifier_key(value)
+        if key not in resolved:
+            applied = value.apply(era if isinstance(value, EraModifier) else sample)
+            resolved[key] = resolve_parameters(applied, era, sample)
+        return copy.deepcopy(resolved[key])
+    if isinstance(value, dict):
+        return {
+            key: resolve_parameters(entry, era, sample) for key, entry in value.items()
+        }
+    if isinstance(value, list):
+        return [resolve_parameters(entry, era, sample) for entry in value]
+    return value
+
+
+class ResolvedConfiguration(Configuration):
+    """
+    Configuration receiving only plain parameter values: the era and sample
+    modifiers are resolved when the parameters are added, once for all scopes
+    they are added to, instead of for every scope and shift during the
+    expansion of the configuration.
+    """
+
+    def __init__(self, era: str, sample: str, *args, **kwargs):
+        self._resolution = (era, sample)
+        super().__init__(era, sample, *args, **kwargs)
+
+    def add_config_parameters(self, scopes, parameters: Dict[str, Any]) -> None:
+        super().add_config_parameters(
+            scopes, resolve_parameters(parameters, *self._resolution)
+        )
@@ -0,0 +1,102 @@
+from __future__ import annotations  # needed for type annotations in > python 3.7
+
+import argparse
+import fnmatch
+import logging
+from typing import Dict, List
+
+
+def read_fraction(filename: str, tree: str, patterns: List[str]) -> Dict[str, float]:
+    """
+    Measure the compressed size of the read branches, given by name or wildcard
+    pattern, relative to the whole tree and the average compressed size of one
+    cluster of the read branches. Without patterns all branches are read.
+    """
+    import ROOT
+
+    infile = ROOT.TFile.Open(filename)
+    events = infile.Get(tree)
+    total_bytes = events.GetZipBytes()
+    names = [branch.GetName() for branch in events.GetListOfBranches()]
+    if patterns:
+        for pattern in patterns:
+            if not fnmatch.filter(names, pattern):
+                logging.warning(f"{pattern} matches no branch of {filename}")
+        names = [
+            name
+            for name in names
+            if any(fnmatch.fnmatchcase(name, pattern) for pattern in patterns)
+        ]
+    read_bytes = 0
+    for name in names:
+        read_bytes += events.GetBranch(name).GetZipBytes("*")
+    clusters = 0
+    iterator = events.GetClusterIterator(0)
+    while iterator.Next() < events.GetEntries():
+        clusters += 1
+    infile.Close()
+    return {
+        "fraction": read_bytes / total_bytes,
+        "bytes_per_cluster": read_bytes / max(clusters, 1),
+    }
+
+
+def cache_factor(fraction: float, clusters: int) -> float:
+    """
+    ROOT sizes the TTreeCache as TTreeCache.Size times the compressed size of one
+    cluster of all branches of the tree. Only the read branches are cached, so the
+    factor is scaled with their fraction to hold the given number of clusters of
+    the read branches: one being processed and the others being prefetched.
+    """
+    return clusters * fraction
+
+
+def write_rootrc(filename: str, factor: float) -> None:
+    with open(filename, "w") as f:
+        # fetch the baskets of the next clusters in a separate thread, while the
+        # event loop processes the current one
+        f.write("TFile.AsyncPrefetching: yes\n")
+        f.write(f"TTreeCache.Size: {factor:.4f}\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Write a .rootrc enabling asynchronous prefetching for the branches read by an executable."
+    )
+    parser.add_argument(
+        "--branches",
+        nargs="*",
+        default=[],
+        help="names or wildcard patterns of the branches read by the executable, "
+        "e.g. Muon_* nMuon, all branches if not given",
+    )
+    parser.add_argument(
+        "--input", required=True, help="representative input file to measure branch sizes"
+    )
+    parser.add_argument("--tree", default="Events")
+    parser.add_argument(
+        "--clusters",
+        type=int,
+        default=3,
+        help="number of clusters of the read branches held in the cache",
+    )
+    parser.add_argument(
+        "--output",
+        default=".rootrc",
+        help="ROOT reads the .rootrc of the working directory of the executable",
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level="INFO")
+
+    measured = read_fraction(args.input, args.tree, args.branches)
+    factor = cache_factor(measured["fraction"], args.clusters)
+    logging.info(
+        f"Read branches are {measured['fraction']:.1%} of the input, "
+        f"{measured['bytes_per_cluster'] / 1024 / 1024:.1f} MB per cluster, "
+        f"TTreeCache.Size {factor:.4f} holds {args.clusters} clusters"
+    )
+    write_rootrc(args.output, factor)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,107 +6,35 @@ from code_generation.producer import Producer, ProducerGroup, Filter
 # Set of producers used for loosest selection of electrons
 ####################
 
-ElectronPtCut = Producer(
-    name="ElectronPtCut",
-    call="physicsobject::CutPt({df}, {input}, {output}, {min_ele_pt})",
-    input=[nanoAOD.Electron_pt],
-    output=[],
-    scopes=["global"],
-)
-ElectronEtaCut = Producer(
-    name="ElectronEtaCut",
-    call="physicsobject::CutEta({df}, {input}, {output}, {max_ele_eta})",
-    input=[nanoAOD.Electron_eta],
-    output=[],
-    scopes=["global"],
-)
-ElectronDxyCut = Producer(
-    name="ElectronDxyCut",
-    call="physicsobject::CutDxy({df}, {input}, {output}, {max_ele_dxy})",
-    input=[nanoAOD.Electron_dxy],
-    output=[],
-    scopes=["global"],
-)
-ElectronDzCut = Producer(
-    name="ElectronDzCut",
-    call="physicsobject::CutDz({df}, {input}, {output}, {max_ele_dz})",
-    input=[nanoAOD.Electron_dz],
-    output=[],
-    scopes=["global"],
-)
-ElectronIDCut = Producer(
-    name="ElectronIDCut",
-    call='physicsobject::electron::CutCBID({df}, {output}, "{ele_id}", {ele_id_wp})',
-    input=[],
-    output=[],
-    scopes=["global"],
-)
-# ElectronIDCut = Producer(
-#     name="ElectronIDCut",
-#     call='physicsobject::electron::CutID({df}, {output}, "{ele_id}")',
-#     input=[],
-#     output=[],
-#     scopes=["global"],
-# )
-ElectronIsoCut = Producer(
-    name="ElectronIsoCut",
-    call="physicsobject::electron::CutIsolation({df}, {output}, {input}, {max_ele_iso})",
-    input=[nanoAOD.Electron_iso],
-    output=[],
-    scopes=["global"],
-)
-BaseElectrons = ProducerGroup(
+BaseElectrons = Producer(
     name="BaseElectrons",
-    call="physicsobject::CombineMasks({df}, {output}, {input})",
-    input=[],
+    call='physicsobject::electron::FusedSelection({df}, {output}, {input}, "{ele_id}", {ele_id_wp}, {min_ele_pt}, {max_ele_eta}, {max_ele_dxy}, {max_ele_dz}, {max_ele_iso})',
+    input=[
+        nanoAOD.Electron_pt,
+        nanoAOD.Electron_eta,
+        nanoAOD.Electron_dxy,
+        nanoAOD.Electron_dz,
+        nanoAOD.Electron_iso,
+    ],
     output=[q.base_electrons_mask],
     scopes=["global"],
-    subproducers=[
-        ElectronPtCut,
-        ElectronEtaCut,
-        ElectronDxyCut,
-        ElectronDzCut,
-        ElectronIDCut,
-        ElectronIsoCut,
-    ],
 )
 
 ####################
 # Set of producers used for more specific selection of electrons in channels
 ####################
 
-GoodElectronPtCut = Producer(
-    name="GoodElectronPtCut",
-    call="physicsobject::CutPt({df}, {input}, {output}, {min_electron_pt})",
-    input=[nanoAOD.Electron_pt],
-    output=[],
-    scopes=["ee", "emet"],
-)
-GoodElectronEtaCut = Producer(
-    name="GoodElectronEtaCut",
-    call="physicsobject::CutEta({df}, {input}, {output}, {max_electron_eta})",
-    input=[nanoAOD.Electron_eta],
-    output=[],
-    scopes=["ee", "emet"],
-)
-GoodElectronIsoCut = Producer(
-    name="GoodElectronIsoCut",
-    call="physicsobject::electron::CutIsolation({df}, {output}, {input}, {electron_iso_cut})",
-    input=[nanoAOD.Electron_iso],
-    output=[],
-    scopes=["ee", "emet"],
-)
-GoodElectrons = ProducerGroup(
+GoodElectrons = Producer(
     name="GoodElectrons",
-    call="physicsobject::CombineMasks({df}, {output}, {input})",
-    input=[q.base_electrons_mask],
+    call="physicsobject::FusedSelectionInMask({df}, {output}, {input}, {min_electron_pt}, {max_electron_eta}, {electron_iso_cut})",
+    input=[
+        q.base_electrons_mask,
+        nanoAOD.Electron_pt,
+        nanoAOD.Electron_eta,
+        nanoAOD.Electron_iso,
+    ],
     output=[q.good_electrons_mask],
     scopes=["ee", "emet"],
-    subproducers=[
-        GoodElectronPtCut,
-        GoodElectronEtaCut,
-        GoodElectronIsoCut,
-    ],
 )
 
 # VetoElectrons = Producer(
@@ -162,7 +90,7 @@ OneGoodElectronFlag = Producer(
 )
 OneGoodElectronFilter = Filter(
     name="OneGoodElectronFilter",
-    call='basefunctions::FilterFlagsAny({df}, "OneGoodElectronFilter", {input})',
+    call='cutflow::FilterFlagsAny({df}, "{cutflow_scope}", "OneGoodElectronFilter", "{cutflow_weight}", {input})',
     input=[q.n_good_electrons_flag],
     scopes=["emet"],
     subproducers=[]
@@ -177,62 +105,18 @@ OneGoodElectron = Producer(
     scopes=["emet"],
 )
 
-ElectronVetoPtCut = Producer(
-    name="ElectronPtCut",
-    call="physicsobject::CutPt({df}, {input}, {output}, {min_electron_veto_pt})",
-    input=[nanoAOD.Electron_pt],
-    output=[],
-    scopes=["emet"],
-)
-ElectronVetoEtaCut = Producer(
-    name="ElectronEtaCut",
-    call="physicsobject::CutEta({df}, {input}, {output}, {max_electron_veto_eta})",
-    input=[nanoAOD.Electron_eta],
-    output=[],
-    scopes=["emet"],
-)
-ElectronVetoDxyCut = Producer(
-    name="ElectronDxyCut",
-    call="physicsobject::CutDxy({df}, {input}, {output}, {max_electron_veto_dxy})",
-    input=[nanoAOD.Electron_dxy],
-    output=[],
-    scopes=["emet"],
-)
-ElectronVetoDzCut = Producer(
-    name="ElectronDzCut",
-    call="physicsobject::CutDz({df}, {input}, {output}, {max_electron_veto_dz})",
-    input=[nanoAOD.Electron_dz],
-    output=[],
-    scopes=["emet"],
-)
-ElectronVetoIDCut = Producer(
-    name="ElectronIDCut",
-    call='physicsobject::electron::CutCBID({df}, {output}, "{electron_veto_id}", {electron_veto_id_wp})',
-    input=[],
-    output=[],
-    scopes=["emet"],
-)
-ElectronVetoIsoCut = Producer(
-    name="ElectronIsoCut",
-    call="physicsobject::electron::CutIsolation({df}, {output}, {input}, {electron_veto_iso_cut})",
-    input=[nanoAOD.Electron_iso],
-    output=[],
-    scopes=["emet"],
-)
-LooseElectrons = ProducerGroup(
+LooseElectrons = Producer(
     name="LooseElectrons",
-    call="physicsobject::CombineMasks({df}, {output}, {input})",
-    input=[],
+    call='physicsobject::electron::FusedSelection({df}, {output}, {input}, "{electron_veto_id}", {electron_veto_id_wp}, {min_electron_veto_pt}, {max_electron_veto_eta}, {max_electron_veto_dxy}, {max_electron_veto_dz}, {electron_veto_iso_cut})',
+    input=[
+        nanoAOD.Electron_pt,
+        nanoAOD.Electron_eta,
+        nanoAOD.Electron_dxy,
+        nanoAOD.Electron_dz,
+        nanoAOD.Electron_iso,
+    ],
     output=[q.loose_electrons_mask],
     scopes=["emet"],
-    subproducers=[
-        ElectronVetoPtCut,
-        ElectronVetoEtaCut,
-        ElectronVetoDxyCut,
-        ElectronVetoDzCut,
-        ElectronVetoIDCut,
-        ElectronVetoIsoCut,
-    ],
 )
 VetoElectrons = Producer(
     name="VetoElectrons",
@@ -252,7 +136,7 @@ ExtraElectronsVeto = Producer(
 )
 VetoElectronFilter = Filter(
     name="VetoElectronFilter",
-    call='basefunctions::FilterFlagsAny({df}, "ExtraLooseElectronVeto", {input})',
+    call='cutflow::FilterFlagsAny({df}, "{cutflow_scope}", "ExtraLooseElectronVeto", "{cutflow_weight}", {input})',
     input=[q.electron_veto_flag],
     scopes=["emet"],
     subproducers=[]
@@ -21,16 +21,39 @@ RunLumiEventFilter = VectorProducer(
     ],
 )
 
-JSONFilter = BaseFilter(
-    name="JSONFilter",
+GoldenJSONFilter = BaseFilter(
+    name="GoldenJSONFilter",
     call='basefunctions::JSONFilter({df}, "{golden_json_file}", {input}, "GoldenJSONFilter")',
     input=[nanoAOD.run, nanoAOD.luminosityBlock],
     scopes=["global"],
 )
+# the events seen and passed by the json filter are counted around it for the cutflow
+GoldenJSONFilterSeen = Producer(
+    name="GoldenJSONFilterSeen",
+    call='cutflow::CountSeen({df}, "{cutflow_scope}", "GoldenJSONFilter", "{cutflow_weight}")',
+    input=[],
+    output=None,
+    scopes=["global"],
+)
+GoldenJSONFilterPassed = Producer(
+    name="GoldenJSONFilterPassed",
+    call='cutflow::CountPassed({df}, "{cutflow_scope}", "GoldenJSONFilter", "{cutflow_weight}")',
+    input=[],
+    output=None,
+    scopes=["global"],
+)
+JSONFilter = ProducerGroup(
+    name="JSONFilter",
+    call=None,
+    input=None,
+    output=None,
+    scopes=["global"],
+    subproducers=[GoldenJSONFilterSeen, GoldenJSONFilter, GoldenJSONFilterPassed],
+)
 
 PrefireWeight = Producer(
     name="PrefireWeight",
-    call="basefunctions::rename<Float_t>({df}, {input}, {output})",
+    call="columns::Alias({df}, {input}, {output})",
     input=[nanoAOD.prefireWeight],
     output=[q.prefireweight],
     scopes=["global"],
@@ -94,6 +117,8 @@ is_diboson = Producer(
     scopes=["global"],
 )
 
+# the flags are constant for an executable, producers depending on the sample should
+# use the {is_<sample>} parameters, which end up as literals in the generated code
 SampleFlags = ProducerGroup(
     name="SampleFlags",
     call=None,
@@ -112,9 +137,31 @@ SampleFlags = ProducerGroup(
     ],
 )
 
+# the metadata record of the executable is written to {metadata_file}, it has to be the
+# first producer of the global scope
+MetadataRecord = Producer(
+    name="MetadataRecord",
+    call='metadata::Open({df}, "{metadata_file}")',
+    input=[],
+    output=None,
+    scopes=["global"],
+)
+
+# the flags are constant for an executable, so they are stored once per output file in
+# the metadata record instead of as per event columns
+SampleFlagsMetadata = Producer(
+    name="SampleFlagsMetadata",
+    call='metadata::SampleFlags({df}, {vec_open}"is_data", "is_embedding", "is_ttbar", "is_dyjets", "is_wjets", "is_ggh_htautau", "is_vbf_htautau", "is_diboson"{vec_close}, {vec_open}{is_data}, {is_embedding}, {is_ttbar}, {is_dyjets}, {is_wjets}, {is_ggh_htautau}, {is_vbf_htautau}, {is_diboson}{vec_close})',
+    input=[],
+    output=None,
+    scopes=["global"],
+)
+
+# equivalent to metfilter::ApplyMetFilter, the events seen and passed by every filter are
+# counted for the cutflow
 MetFilter = VectorProducer(
     name="MetFilter",
-    call='metfilter::ApplyMetFilter({df}, "{met_filters}", "{met_filters}")',
+    call='cutflow::FilterFlagsAny({df}, "{cutflow_scope}", "{met_filters}", "{cutflow_weight}", "{met_filters}")',
     input=[],
     output=None,
     scopes=["global"],
@@ -123,7 +170,7 @@ MetFilter = VectorProducer(
 
 Lumi = Producer(
     name="Lumi",
-    call="basefunctions::rename<UInt_t>({df}, {input}, {output})",
+    call="columns::Alias({df}, {input}, {output})",
     input=[nanoAOD.luminosityBlock],
     output=[q.lumi],
     scopes=["global"],
@@ -131,7 +178,7 @@ Lumi = Producer(
 
 npartons = Producer(
     name="npartons",
-    call="basefunctions::rename<UChar_t>({df}, {input}, {output})",
+    call="columns::Alias({df}, {input}, {output})",
     input=[nanoAOD.LHE_Njets],
     output=[q.npartons],
     scopes=["global"],
@@ -147,12 +194,22 @@ PUweights = Producer(
 
 EventGenWeight = Producer(
     name="EventGenWeight",
-    call="basefunctions::rename<Float_t>({df}, {input}, {output})",
+    call="columns::Alias({df}, {input}, {output})",
     input=[nanoAOD.genWeight],
     output=[q.genweight],
     scopes=["global"],
 )
 
+# the sums are stored once per output file in the metadata record, so it has to be added
+# before any filter to see all events
+SumOfWeights = Producer(
+    name="SumOfWeights",
+    call="sumofweights::Accumulate({df}, {input})",
+    input=[q.genweight, q.npartons],
+    output=None,
+    scopes=["global"],
+)
+
 ZPtMassReweighting = Producer(
     name="ZPtMassReweighting",
     call='reweighting::zPtMassReweighting({df}, {output}, {input}, "{zptmass_file}", "{zptmass_functor}", "{zptmass_arguments}")',
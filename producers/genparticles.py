@@ -407,3 +407,36 @@ MMTrueGenDiTauPairQuantities = ProducerGroup(
         gen_m_vis,
     ],
 )
+####################
+# Gen matching and gen pair quantities of both leptons in one producer
+####################
+MMGenDileptonQuantities = Producer(
+    name="MMGenDileptonQuantities",
+    call="quantities::GenDileptonQuantities({df}, {output_vec}, {input})",
+    input=[
+        q.selectedLepton,
+        nanoAOD.Muon_genMatch,
+        nanoAOD.Muon_indexToGen,
+        nanoAOD.GenParticle_pt,
+        nanoAOD.GenParticle_eta,
+        nanoAOD.GenParticle_phi,
+        nanoAOD.GenParticle_mass,
+        nanoAOD.GenParticle_pdgId,
+    ],
+    output=[
+        q.gen_match_1,
+        q.gen_pt_1,
+        q.gen_eta_1,
+        q.gen_phi_1,
+        q.gen_mass_1,
+        q.gen_pdgid_1,
+        q.gen_match_2,
+        q.gen_pt_2,
+        q.gen_eta_2,
+        q.gen_phi_2,
+        q.gen_mass_2,
+        q.gen_pdgid_2,
+        q.gen_m_vis,
+    ],
+    scopes=["mm"],
+)
@@ -50,14 +50,14 @@ JetMassCorrection = Producer(
 # in data and embdedded sample, we simply rename the nanoAOD jets to the jet_pt_corrected column
 RenameJetPt = Producer(
     name="RenameJetPt",
-    call="basefunctions::rename<ROOT::RVec<float>>({df}, {input}, {output})",
+    call="columns::Alias({df}, {input}, {output})",
     input=[nanoAOD.Jet_pt],
     output=[q.Jet_pt_corrected],
     scopes=["global"],
 )
 RenameJetMass = Producer(
     name="RenameJetMass",
-    call="basefunctions::rename<ROOT::RVec<float>>({df}, {input}, {output})",
+    call="columns::Alias({df}, {input}, {output})",
     input=[nanoAOD.Jet_mass],
     output=[q.Jet_mass_corrected],
     scopes=["global"],
@@ -207,6 +207,57 @@ BJetCollection = ProducerGroup(
     subproducers=[GoodBJetsWithVeto],
 )
 
+####################
+# Fused selection of the good jet and good b-jet collections in a single loop over the jets,
+# replaces GoodJets and GoodBJets in the global scope together with JetCollection and BJetCollection
+####################
+GoodJetCollections = Producer(
+    name="GoodJetCollections",
+    call="jet::GoodJetCollections({df}, {output_vec}, {input}, {min_jet_pt}, {max_jet_eta}, {jet_id}, {jet_puid}, {jet_puid_max_pt}, {min_bjet_pt}, {max_bjet_eta}, {btag_cut}, {deltaR_jet_veto}, {n_leading_jets}, {n_leading_bjets})",
+    input={
+        "mm": [
+            q.Jet_pt_corrected,
+            nanoAOD.Jet_eta,
+            nanoAOD.Jet_phi,
+            nanoAOD.Jet_ID,
+            nanoAOD.Jet_PUID,
+            nanoAOD.BJet_discriminator,
+            q.p4_1,
+            q.p4_2,
+        ],
+        "mmet": [
+            q.Jet_pt_corrected,
+            nanoAOD.Jet_eta,
+            nanoAOD.Jet_phi,
+            nanoAOD.Jet_ID,
+            nanoAOD.Jet_PUID,
+            nanoAOD.BJet_discriminator,
+            q.p4_1,
+        ],
+        "ee": [
+            q.Jet_pt_corrected,
+            nanoAOD.Jet_eta,
+            nanoAOD.Jet_phi,
+            nanoAOD.Jet_ID,
+            nanoAOD.Jet_PUID,
+            nanoAOD.BJet_discriminator,
+            q.p4_1,
+            q.p4_2,
+        ],
+        "emet": [
+            q.Jet_pt_corrected,
+            nanoAOD.Jet_eta,
+            nanoAOD.Jet_phi,
+            nanoAOD.Jet_ID,
+            nanoAOD.Jet_PUID,
+            nanoAOD.BJet_discriminator,
+            q.p4_1,
+        ],
+    },
+    output=[q.good_jet_collection, q.good_bjet_collection],
+    scopes=["mm", "mmet", "ee", "emet"],
+)
+
 ##########################
 # Basic Jet Quantities
 # njets, pt, eta, phi, b-tag value
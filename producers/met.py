@@ -28,7 +28,7 @@ BuildPFMetVector = Producer(
 )
 MetCov00 = Producer(
     name="MetCov00",
-    call="basefunctions::rename<float>({df}, {input}, {output})",
+    call="columns::Alias({df}, {input}, {output})",
     input=[
         nanoAOD.MET_covXX,
     ],
@@ -37,7 +37,7 @@ MetCov00 = Producer(
 )
 MetCov01 = Producer(
     name="MetCov01",
-    call="basefunctions::rename<float>({df}, {input}, {output})",
+    call="columns::Alias({df}, {input}, {output})",
     input=[
         nanoAOD.MET_covXY,
     ],
@@ -46,7 +46,7 @@ MetCov01 = Producer(
 )
 MetCov10 = Producer(
     name="MetCov10",
-    call="basefunctions::rename<float>({df}, {input}, {output})",
+    call="columns::Alias({df}, {input}, {output})",
     input=[
         nanoAOD.MET_covXY,
     ],
@@ -55,7 +55,7 @@ MetCov10 = Producer(
 )
 MetCov11 = Producer(
     name="MetCov11",
-    call="basefunctions::rename<float>({df}, {input}, {output})",
+    call="columns::Alias({df}, {input}, {output})",
     input=[
         nanoAOD.MET_covYY,
     ],
@@ -64,7 +64,7 @@ MetCov11 = Producer(
 )
 MetSumEt = Producer(
     name="MetSumEt",
-    call="basefunctions::rename<float>({df}, {input}, {output})",
+    call="columns::Alias({df}, {input}, {output})",
     input=[
         nanoAOD.MET_sumEt,
     ],
@@ -282,3 +282,46 @@ PFMetCorrections = ProducerGroup(
         PFMetPhi,
     ],
 )
+
+####################
+# Specialized MET corrections for data: propagateLeptons, propagateJets and applyRecoilCorrections
+# are all false, so the corrections reduce to renaming the uncorrected MET
+####################
+RenameMetData = Producer(
+    name="RenameMetData",
+    call="columns::Alias({df}, {input}, {output})",
+    input=[q.met_p4],
+    output=[q.met_p4_recoilcorrected],
+    scopes=["mm", "mmet", "ee", "emet"],
+)
+RenamePFMetData = Producer(
+    name="RenamePFMetData",
+    call="columns::Alias({df}, {input}, {output})",
+    input=[q.pfmet_p4],
+    output=[q.pfmet_p4_recoilcorrected],
+    scopes=["mm", "mmet", "ee", "emet"],
+)
+MetCorrections_data = ProducerGroup(
+    name="MetCorrections_data",
+    call=None,
+    input=None,
+    output=None,
+    scopes=["mm", "mmet", "ee", "emet"],
+    subproducers=[
+        RenameMetData,
+        MetPt,
+        MetPhi,
+    ],
+)
+PFMetCorrections_data = ProducerGroup(
+    name="PFMetCorrections_data",
+    call=None,
+    input=None,
+    output=None,
+    scopes=["mm", "mmet", "ee", "emet"],
+    subproducers=[
+        RenamePFMetData,
+        PFMetPt,
+        PFMetPhi,
+    ],
+)
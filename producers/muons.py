@@ -6,62 +6,18 @@ from code_generation.producer import Producer, ProducerGroup, Filter
 # Set of producers used for loosest selection of muons
 ####################
 
-MuonPtCut = Producer(
-    name="MuonPtCut",
-    call="physicsobject::CutPt({df}, {input}, {output}, {min_muon_pt})",
-    input=[nanoAOD.Muon_pt],
-    output=[],
-    scopes=["global"],
-)
-MuonEtaCut = Producer(
-    name="MuonEtaCut",
-    call="physicsobject::CutEta({df}, {input}, {output}, {max_muon_eta})",
-    input=[nanoAOD.Muon_eta],
-    output=[],
-    scopes=["global"],
-)
-MuonDxyCut = Producer(
-    name="MuonDxyCut",
-    call="physicsobject::CutDxy({df}, {input}, {output}, {max_muon_dxy})",
-    input=[nanoAOD.Muon_dxy],
-    output=[],
-    scopes=["global"],
-)
-MuonDzCut = Producer(
-    name="MuonDzCut",
-    call="physicsobject::CutDz({df}, {input}, {output}, {max_muon_dz})",
-    input=[nanoAOD.Muon_dz],
-    output=[],
-    scopes=["global"],
-)
-MuonIDCut = Producer(
-    name="MuonIDCut",
-    call='physicsobject::muon::CutID({df}, {output}, "{muon_id}")',
-    input=[],
-    output=[],
-    scopes=["global"],
-)
-MuonIsoCut = Producer(
-    name="MuonIsoCut",
-    call="physicsobject::muon::CutIsolation({df}, {output}, {input}, {muon_iso_cut})",
-    input=[nanoAOD.Muon_iso],
-    output=[],
-    scopes=["global"],
-)
-BaseMuons = ProducerGroup(
+BaseMuons = Producer(
     name="BaseMuons",
-    call="physicsobject::CombineMasks({df}, {output}, {input})",
-    input=[],
+    call='physicsobject::muon::FusedSelection({df}, {output}, {input}, "{muon_id}", {min_muon_pt}, {max_muon_eta}, {max_muon_dxy}, {max_muon_dz}, {muon_iso_cut})',
+    input=[
+        nanoAOD.Muon_pt,
+        nanoAOD.Muon_eta,
+        nanoAOD.Muon_dxy,
+        nanoAOD.Muon_dz,
+        nanoAOD.Muon_iso,
+    ],
     output=[q.base_muons_mask],
     scopes=["global"],
-    subproducers=[
-        MuonPtCut,
-        MuonEtaCut,
-        MuonDxyCut,
-        MuonDzCut,
-        MuonIDCut,
-        MuonIsoCut,
-    ],
 )
 
 ####################
@@ -75,31 +31,17 @@ GoodMuonPtCut = Producer(
     output=[],
     scopes=["mm", "mmet"],
 )
-GoodMuonEtaCut = Producer(
-    name="GoodMuonEtaCut",
-    call="physicsobject::CutEta({df}, {input}, {output}, {max_muon_eta})",
-    input=[nanoAOD.Muon_eta],
-    output=[],
-    scopes=["mm", "mmet"],
-)
-GoodMuonIsoCut = Producer(
-    name="GoodMuonIsoCut",
-    call="physicsobject::electron::CutIsolation({df}, {output}, {input}, {muon_iso_cut})",
-    input=[nanoAOD.Muon_iso],
-    output=[],
-    scopes=["mm", "mmet"],
-)
-GoodMuons = ProducerGroup(
+GoodMuons = Producer(
     name="GoodMuons",
-    call="physicsobject::CombineMasks({df}, {output}, {input})",
-    input=[q.base_muons_mask],
+    call="physicsobject::FusedSelectionInMask({df}, {output}, {input}, {min_muon_pt}, {max_muon_eta}, {muon_iso_cut})",
+    input=[
+        q.base_muons_mask,
+        nanoAOD.Muon_pt,
+        nanoAOD.Muon_eta,
+        nanoAOD.Muon_iso,
+    ],
     output=[q.good_muons_mask],
     scopes=["mm", "mmet"],
-    subproducers=[
-        GoodMuonPtCut,
-        GoodMuonEtaCut,
-        GoodMuonIsoCut,
-    ],
 )
 NumberOfGoodMuons = Producer(
     name="NumberOfGoodMuons",
@@ -153,7 +95,7 @@ OneGoodMuonFlag = Producer(
 )
 OneGoodMuonFilter = Filter(
     name="OneGoodMuonFilter",
-    call='basefunctions::FilterFlagsAny({df}, "OneGoodMuonFilter", {input})',
+    call='cutflow::FilterFlagsAny({df}, "{cutflow_scope}", "OneGoodMuonFilter", "{cutflow_weight}", {input})',
     input=[q.n_good_muons_flag],
     scopes=["mmet"],
     subproducers=[]
@@ -168,62 +110,18 @@ OneGoodMuon = Producer(
     scopes=["mmet"],
 )
 
-MuonVetoPtCut = Producer(
-    name="MuonPtCut",
-    call="physicsobject::CutPt({df}, {input}, {output}, {min_muon_veto_pt})",
-    input=[nanoAOD.Muon_pt],
-    output=[],
-    scopes=["mmet"],
-)
-MuonVetoEtaCut = Producer(
-    name="MuonEtaCut",
-    call="physicsobject::CutEta({df}, {input}, {output}, {max_muon_veto_eta})",
-    input=[nanoAOD.Muon_eta],
-    output=[],
-    scopes=["mmet"],
-)
-MuonVetoDxyCut = Producer(
-    name="MuonDxyCut",
-    call="physicsobject::CutDxy({df}, {input}, {output}, {max_muon_veto_dxy})",
-    input=[nanoAOD.Muon_dxy],
-    output=[],
-    scopes=["mmet"],
-)
-MuonVetoDzCut = Producer(
-    name="MuonDzCut",
-    call="physicsobject::CutDz({df}, {input}, {output}, {max_muon_veto_dz})",
-    input=[nanoAOD.Muon_dz],
-    output=[],
-    scopes=["mmet"],
-)
-MuonVetoIDCut = Producer(
-    name="MuonIDCut",
-    call='physicsobject::muon::CutID({df}, {output}, "{muon_veto_id}")',
-    input=[],
-    output=[],
-    scopes=["mmet"],
-)
-MuonVetoIsoCut = Producer(
-    name="MuonIsoCut",
-    call="physicsobject::muon::CutIsolation({df}, {output}, {input}, {muon_veto_iso_cut})",
-    input=[nanoAOD.Muon_iso],
-    output=[],
-    scopes=["mmet"],
-)
-LooseMuons = ProducerGroup(
+LooseMuons = Producer(
     name="LooseMuons",
-    call="physicsobject::CombineMasks({df}, {output}, {input})",
-    input=[],
+    call='physicsobject::muon::FusedSelection({df}, {output}, {input}, "{muon_veto_id}", {min_muon_veto_pt}, {max_muon_veto_eta}, {max_muon_veto_dxy}, {max_muon_veto_dz}, {muon_veto_iso_cut})',
+    input=[
+        nanoAOD.Muon_pt,
+        nanoAOD.Muon_eta,
+        nanoAOD.Muon_dxy,
+        nanoAOD.Muon_dz,
+        nanoAOD.Muon_iso,
+    ],
     output=[q.loose_muons_mask],
     scopes=["mmet"],
-    subproducers=[
-        MuonVetoPtCut,
-        MuonVetoEtaCut,
-        MuonVetoDxyCut,
-        MuonVetoDzCut,
-        MuonVetoIDCut,
-        MuonVetoIsoCut,
-    ],
 )
 VetoMuons = Producer(
     name="VetoMuons",
@@ -243,7 +141,7 @@ ExtraMuonsVeto = Producer(
 )
 VetoMuonFilter = Filter(
     name="VetoMuonFilter",
-    call='basefunctions::FilterFlagsAny({df}, "ExtraLooseMuonVeto", {input})',
+    call='cutflow::FilterFlagsAny({df}, "{cutflow_scope}", "ExtraLooseMuonVeto", "{cutflow_weight}", {input})',
     input=[q.muon_veto_flag],
     scopes=["mmet"],
     subproducers=[]
@@ -579,3 +579,114 @@ LepMETQuantities = ProducerGroup(
         "emet": [UnrollElLV1, mt_1],
     },
 )
+
+####################
+# Compound producers calculating the lepton and dilepton quantities, and separately the MET and jet dependent quantities, each in one Define
+####################
+
+LeptonKinematics = Producer(
+    name="LeptonKinematics",
+    call="quantities::LeptonKinematics({df}, {output_vec}, {input})",
+    input=[q.p4_1],
+    output=[q.pt_1, q.eta_1, q.phi_1, q.mass_1],
+    scopes=["mmet", "emet"],
+)
+DileptonKinematics = Producer(
+    name="DileptonKinematics",
+    call="quantities::DileptonKinematics({df}, {output_vec}, {input})",
+    input=[q.p4_1, q.p4_2],
+    output=[
+        q.pt_1,
+        q.eta_1,
+        q.phi_1,
+        q.mass_1,
+        q.pt_2,
+        q.eta_2,
+        q.phi_2,
+        q.mass_2,
+        q.m_vis,
+        q.pt_vis,
+    ],
+    scopes=["mm", "ee"],
+)
+DileptonMETKinematics = Producer(
+    name="DileptonMETKinematics",
+    call="quantities::DileptonMETKinematics({df}, {output_vec}, {input})",
+    input=[q.p4_1, q.p4_2, q.jet_p4_1, q.jet_p4_2, q.met_p4_recoilcorrected],
+    output=[
+        q.pzetamissvis,
+        q.mTdileptonMET,
+        q.mt_1,
+        q.mt_2,
+        q.pt_tt,
+        q.pt_ttjj,
+        q.mt_tot,
+    ],
+    scopes=["mm", "ee"],
+)
+MuonQuantities1 = ProducerGroup(
+    name="MuonQuantities1",
+    call=None,
+    input=None,
+    output=None,
+    scopes=["mm", "mmet"],
+    subproducers=[muon_dxy_1, muon_dz_1, muon_q_1, muon_iso_1],
+)
+MuonQuantities2 = ProducerGroup(
+    name="MuonQuantities2",
+    call=None,
+    input=None,
+    output=None,
+    scopes=["mm"],
+    subproducers=[muon_dxy_2, muon_dz_2, muon_q_2, muon_iso_2],
+)
+ElectronQuantities1 = ProducerGroup(
+    name="ElectronQuantities1",
+    call=None,
+    input=None,
+    output=None,
+    scopes=["ee", "emet"],
+    subproducers=[electron_dxy_1, electron_dz_1, electron_q_1, electron_iso_1],
+)
+ElectronQuantities2 = ProducerGroup(
+    name="ElectronQuantities2",
+    call=None,
+    input=None,
+    output=None,
+    scopes=["ee"],
+    subproducers=[electron_dxy_2, electron_dz_2, electron_q_2, electron_iso_2],
+)
+# replaces DileptonQuantities and DileptonMETQuantities
+DileptonKinematicQuantities = ProducerGroup(
+    name="DileptonKinematicQuantities",
+    call=None,
+    input=None,
+    output=None,
+    scopes=["mm", "ee"],
+    subproducers={
+        "mm": [
+            MuonQuantities1,
+            MuonQuantities2,
+            DileptonKinematics,
+            DileptonMETKinematics,
+        ],
+        "ee": [
+            ElectronQuantities1,
+            ElectronQuantities2,
+            DileptonKinematics,
+            DileptonMETKinematics,
+        ],
+    },
+)
+# replaces LepMETQuantities
+LepMETKinematicQuantities = ProducerGroup(
+    name="LepMETKinematicQuantities",
+    call=None,
+    input=None,
+    output=None,
+    scopes=["mmet", "emet"],
+    subproducers={
+        "mmet": [MuonQuantities1, LeptonKinematics, mt_1],
+        "emet": [ElectronQuantities1, LeptonKinematics, mt_1],
+    },
+)
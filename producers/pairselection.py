@@ -90,7 +90,7 @@ GoodLLPairFlag = Producer(
 
 GoodLLPairFilter = Filter(
     name="GoodLLPairFilter",
-    call='basefunctions::FilterFlagsAny({df}, "GoodLLPairFilter", {input})',
+    call='cutflow::FilterFlagsAny({df}, "{cutflow_scope}", "GoodLLPairFilter", "{cutflow_weight}", {input})',
     input=[],
     scopes=["mm", "ee"],
     subproducers=[GoodLLPairFlag],
@@ -1,15 +1,35 @@
 from ..quantities import output as q
 from ..quantities import nanoAOD as nanoAOD
-from code_generation.producer import ExtendedVectorProducer
+from ..triggersetup import ELECTRON_HLT_PATHS, MUON_HLT_PATHS
+from code_generation.producer import ExtendedVectorProducer, Producer
+from code_generation.quantity import NanoAODQuantity
 
 ####################
 # Set of producers used for trigger flags
 ####################
 
-MMGenerateSingleMuonTriggerFlags1 = ExtendedVectorProducer(
-    name="MMGenerateSingleMuonTriggerFlags1",
-    call='trigger::GenerateSingleTriggerFlag({df}, {output}, {input}, "{hlt_path}", {ptcut}, {etacut}, {trigger_particle_id}, {filterbit}, {max_deltaR_triggermatch} )',
+# the trigger definitions are compiled in triggersetup.py: every HLT path is read
+# once per scope, the distinct selections of a leg are matched to the trigger
+# objects in a single pass and the flags are unpacked from the result
+muon_hlt_paths = [NanoAODQuantity(path) for path in MUON_HLT_PATHS]
+electron_hlt_paths = [NanoAODQuantity(path) for path in ELECTRON_HLT_PATHS]
+TriggerDecisions = Producer(
+    name="TriggerDecisions",
+    call="trigger::HLTDecisions({df}, {output}, {input})",
+    input={
+        "mm": muon_hlt_paths,
+        "mmet": muon_hlt_paths,
+        "ee": electron_hlt_paths,
+        "emet": electron_hlt_paths,
+    },
+    output=[q.trigger_decisions],
+    scopes=["mm", "mmet", "ee", "emet"],
+)
+MMTriggerSelections1 = Producer(
+    name="MMTriggerSelections1",
+    call="trigger::MatchTriggerSelections({df}, {output}, {input}, {vec_open}{singlemoun_trigger_1_path_index}{vec_close}, {vec_open}{singlemoun_trigger_1_ptcut}{vec_close}, {vec_open}{singlemoun_trigger_1_etacut}{vec_close}, {vec_open}{singlemoun_trigger_1_trigger_particle_id}{vec_close}, {vec_open}{singlemoun_trigger_1_filterbit}{vec_close}, {vec_open}{singlemoun_trigger_1_max_deltaR_triggermatch}{vec_close})",
     input=[
+        q.trigger_decisions,
         q.p4_1,
         nanoAOD.TriggerObject_bit,
         nanoAOD.TriggerObject_id,
@@ -17,14 +37,14 @@ MMGenerateSingleMuonTriggerFlags1 = ExtendedVectorProducer(
         nanoAOD.TriggerObject_eta,
         nanoAOD.TriggerObject_phi,
     ],
-    output="flagname",
-    scope=["mm", "mmet"],
-    vec_config="singlemoun_trigger_1",
+    output=[q.trigger_selections_1],
+    scopes=["mm", "mmet"],
 )
-MMGenerateSingleMuonTriggerFlags2 = ExtendedVectorProducer(
-    name="MMGenerateSingleMuonTriggerFlags2",
-    call='trigger::GenerateSingleTriggerFlag({df}, {output}, {input}, "{hlt_path}", {ptcut}, {etacut}, {trigger_particle_id}, {filterbit}, {max_deltaR_triggermatch} )',
+MMTriggerSelections2 = Producer(
+    name="MMTriggerSelections2",
+    call="trigger::MatchTriggerSelections({df}, {output}, {input}, {vec_open}{singlemoun_trigger_2_path_index}{vec_close}, {vec_open}{singlemoun_trigger_2_ptcut}{vec_close}, {vec_open}{singlemoun_trigger_2_etacut}{vec_close}, {vec_open}{singlemoun_trigger_2_trigger_particle_id}{vec_close}, {vec_open}{singlemoun_trigger_2_filterbit}{vec_close}, {vec_open}{singlemoun_trigger_2_max_deltaR_triggermatch}{vec_close})",
     input=[
+        q.trigger_decisions,
         q.p4_2,
         nanoAOD.TriggerObject_bit,
         nanoAOD.TriggerObject_id,
@@ -32,15 +52,14 @@ MMGenerateSingleMuonTriggerFlags2 = ExtendedVectorProducer(
         nanoAOD.TriggerObject_eta,
         nanoAOD.TriggerObject_phi,
     ],
-    output="flagname",
-    scope=["mm"],
-    vec_config="singlemoun_trigger_2",
+    output=[q.trigger_selections_2],
+    scopes=["mm"],
 )
-
-EEGenerateSingleElectronTriggerFlags1 = ExtendedVectorProducer(
-    name="EEGenerateSingleElectronTriggerFlags1",
-    call='trigger::GenerateSingleTriggerFlag({df}, {output}, {input}, "{hlt_path}", {ptcut}, {etacut}, {trigger_particle_id}, {filterbit}, {max_deltaR_triggermatch} )',
+EETriggerSelections1 = Producer(
+    name="EETriggerSelections1",
+    call="trigger::MatchTriggerSelections({df}, {output}, {input}, {vec_open}{singleelectron_trigger_1_path_index}{vec_close}, {vec_open}{singleelectron_trigger_1_ptcut}{vec_close}, {vec_open}{singleelectron_trigger_1_etacut}{vec_close}, {vec_open}{singleelectron_trigger_1_trigger_particle_id}{vec_close}, {vec_open}{singleelectron_trigger_1_filterbit}{vec_close}, {vec_open}{singleelectron_trigger_1_max_deltaR_triggermatch}{vec_close})",
     input=[
+        q.trigger_decisions,
         q.p4_1,
         nanoAOD.TriggerObject_bit,
         nanoAOD.TriggerObject_id,
@@ -48,14 +67,14 @@ EEGenerateSingleElectronTriggerFlags1 = ExtendedVectorProducer(
         nanoAOD.TriggerObject_eta,
         nanoAOD.TriggerObject_phi,
     ],
-    output="flagname",
-    scope=["ee", "emet"],
-    vec_config="singleelectron_trigger_1",
+    output=[q.trigger_selections_1],
+    scopes=["ee", "emet"],
 )
-EEGenerateSingleElectronTriggerFlags2 = ExtendedVectorProducer(
-    name="EEGenerateSingleElectronTriggerFlags2",
-    call='trigger::GenerateSingleTriggerFlag({df}, {output}, {input}, "{hlt_path}", {ptcut}, {etacut}, {trigger_particle_id}, {filterbit}, {max_deltaR_triggermatch} )',
+EETriggerSelections2 = Producer(
+    name="EETriggerSelections2",
+    call="trigger::MatchTriggerSelections({df}, {output}, {input}, {vec_open}{singleelectron_trigger_2_path_index}{vec_close}, {vec_open}{singleelectron_trigger_2_ptcut}{vec_close}, {vec_open}{singleelectron_trigger_2_etacut}{vec_close}, {vec_open}{singleelectron_trigger_2_trigger_particle_id}{vec_close}, {vec_open}{singleelectron_trigger_2_filterbit}{vec_close}, {vec_open}{singleelectron_trigger_2_max_deltaR_triggermatch}{vec_close})",
     input=[
+        q.trigger_decisions,
         q.p4_2,
         nanoAOD.TriggerObject_bit,
         nanoAOD.TriggerObject_id,
@@ -63,6 +82,39 @@ EEGenerateSingleElectronTriggerFlags2 = ExtendedVectorProducer(
         nanoAOD.TriggerObject_eta,
         nanoAOD.TriggerObject_phi,
     ],
+    output=[q.trigger_selections_2],
+    scopes=["ee"],
+)
+
+MMGenerateSingleMuonTriggerFlags1 = ExtendedVectorProducer(
+    name="MMGenerateSingleMuonTriggerFlags1",
+    call="trigger::UnpackTriggerFlag({df}, {output}, {input}, {selection_index})",
+    input=[q.trigger_selections_1],
+    output="flagname",
+    scope=["mm", "mmet"],
+    vec_config="singlemoun_trigger_1",
+)
+MMGenerateSingleMuonTriggerFlags2 = ExtendedVectorProducer(
+    name="MMGenerateSingleMuonTriggerFlags2",
+    call="trigger::UnpackTriggerFlag({df}, {output}, {input}, {selection_index})",
+    input=[q.trigger_selections_2],
+    output="flagname",
+    scope=["mm"],
+    vec_config="singlemoun_trigger_2",
+)
+
+EEGenerateSingleElectronTriggerFlags1 = ExtendedVectorProducer(
+    name="EEGenerateSingleElectronTriggerFlags1",
+    call="trigger::UnpackTriggerFlag({df}, {output}, {input}, {selection_index})",
+    input=[q.trigger_selections_1],
+    output="flagname",
+    scope=["ee", "emet"],
+    vec_config="singleelectron_trigger_1",
+)
+EEGenerateSingleElectronTriggerFlags2 = ExtendedVectorProducer(
+    name="EEGenerateSingleElectronTriggerFlags2",
+    call="trigger::UnpackTriggerFlag({df}, {output}, {input}, {selection_index})",
+    input=[q.trigger_selections_2],
     output="flagname",
     scope=["ee"],
     vec_config="singleelectron_trigger_2",
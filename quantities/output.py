@@ -42,6 +42,9 @@ gen_dileptonpair = Quantity("gen_dileptonpair")
 truegenpair = Quantity("truegenpair")
 good_jet_collection = Quantity("good_jet_collection")
 good_bjet_collection = Quantity("good_bjet_collection")
+trigger_decisions = Quantity("trigger_decisions")
+trigger_selections_1 = Quantity("trigger_selections_1")
+trigger_selections_2 = Quantity("trigger_selections_2")
 
 nelectrons = Quantity("nelectrons")
 nmuons = Quantity("nmuons")
@@ -0,0 +1,165 @@
+from __future__ import annotations  # needed for type annotations in > python 3.7
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import shutil
+import subprocess
+from typing import Dict, List
+
+
+def chunk_inputs(inputs: List[str], files_per_chunk: int) -> List[List[str]]:
+    return [
+        inputs[start : start + files_per_chunk]
+        for start in range(0, len(inputs), files_per_chunk)
+    ]
+
+
+def executable_hash(executable: str) -> str:
+    """Hash the content of the executable, a rebuilt executable gets a new hash."""
+    digest = hashlib.sha256()
+    with open(executable, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def chunk_key(executable: str, content_hash: str, inputs: List[str]) -> str:
+    """
+    Identify a chunk by the executable, its content and the inputs, so a changed
+    job is rerun, also if the executable was rebuilt under the same name.
+    """
+    content = json.dumps([os.path.basename(executable), content_hash, inputs])
+    return hashlib.sha256(content.encode()).hexdigest()[:16]
+
+
+def shared_executable(executable: str, samplemap: str) -> str:
+    """
+    Resolve the executable of a sample with the samplemap written by the generation
+    with --share-executables. Samples sharing the executable of another sample have
+    no executable of their own. Executables split by scope or by the shift budget
+    keep their suffix.
+    """
+    with open(samplemap) as f:
+        executables = json.load(f)["executables"]
+    folder, name = os.path.split(executable)
+    if name in executables:
+        return os.path.join(folder, executables[name])
+    for base, shared in executables.items():
+        if name.startswith(f"{base}_"):
+            return os.path.join(folder, shared + name[len(base) :])
+    return executable
+
+
+def load_manifest(filename: str) -> Dict:
+    if not os.path.exists(filename):
+        return {}
+    with open(filename) as f:
+        return json.load(f)
+
+
+def store_manifest(filename: str, manifest: Dict) -> None:
+    # write to a temporary file first, a crash must not leave a truncated manifest
+    with open(f"{filename}.tmp", "w") as f:
+        json.dump(manifest, f, indent=4)
+    os.replace(f"{filename}.tmp", filename)
+
+
+def run_chunk(executable: str, inputs: List[str], outdir: str, key: str) -> List[str]:
+    """
+    Run the executable on one chunk in a scratch directory and move its outputs
+    into outdir only after it succeeded, so outdir never contains partial files.
+    The scratch directory is the working directory of the executable, files
+    written there, like the metadata record, are prefixed with the chunk key.
+    """
+    scratch = os.path.abspath(os.path.join(outdir, f".chunk_{key}"))
+    if os.path.exists(scratch):
+        shutil.rmtree(scratch)
+    os.makedirs(scratch)
+    # local inputs are relative to the working directory of the job, remote ones
+    # are given as urls, e.g. root://
+    command = [executable, os.path.join(scratch, f"{key}.root")] + [
+        filename if "://" in filename else os.path.abspath(filename)
+        for filename in inputs
+    ]
+    process = subprocess.run(command, cwd=scratch)
+    if process.returncode != 0:
+        raise RuntimeError(
+            f"{' '.join(command)} failed with exit code {process.returncode}"
+        )
+    outputs = []
+    for filename in sorted(os.listdir(scratch)):
+        name = filename if filename.startswith(key) else f"{key}_{filename}"
+        target = os.path.join(outdir, name)
+        os.replace(os.path.join(scratch, filename), target)
+        outputs.append(target)
+    os.rmdir(scratch)
+    return outputs
+
+
+def run_resumable(
+    executable: str, inputs: List[str], outdir: str, files_per_chunk: int
+) -> Dict:
+    """
+    Process the inputs in chunks of files and record every finished chunk in a
+    manifest in outdir. A restarted job with the same, unchanged executable and
+    the same inputs skips the chunks already in the manifest and continues with
+    the first unfinished one, so a preemption only loses the chunk being
+    processed.
+    """
+    if not os.path.exists(outdir):
+        os.makedirs(outdir)
+    manifest_file = os.path.join(outdir, "manifest.json")
+    manifest = load_manifest(manifest_file)
+    chunks = chunk_inputs(inputs, files_per_chunk)
+    content_hash = executable_hash(executable)
+    for index, chunk in enumerate(chunks):
+        key = chunk_key(executable, content_hash, chunk)
+        if key in manifest:
+            logging.info(f"Chunk {index + 1}/{len(chunks)} already processed, skipping")
+            continue
+        logging.info(f"Processing chunk {index + 1}/{len(chunks)}: {chunk}")
+        outputs = run_chunk(executable, chunk, outdir, key)
+        manifest[key] = {"inputs": chunk, "outputs": outputs}
+        store_manifest(manifest_file, manifest)
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run a generated executable in resumable chunks of input files."
+    )
+    parser.add_argument("--executable", required=True)
+    parser.add_argument("--input", nargs="+", required=True, help="input nanoAOD files")
+    parser.add_argument("--outdir", required=True)
+    parser.add_argument(
+        "--files-per-chunk",
+        type=int,
+        default=1,
+        help="number of input files processed by one call of the executable",
+    )
+    parser.add_argument(
+        "--samplemap",
+        default=None,
+        help="samplemap of the generation, the executable of a sample sharing the "
+        "executable of another sample is replaced by the shared one",
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level="INFO")
+
+    executable = args.executable
+    if args.samplemap is not None:
+        executable = shared_executable(executable, args.samplemap)
+        logging.info(f"Using the executable {executable}")
+    run_resumable(
+        os.path.abspath(executable),
+        args.input,
+        args.outdir,
+        args.files_per_chunk,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,308 @@
+from __future__ import annotations  # needed for type annotations in > python 3.7
+
+import argparse
+import ast
+import logging
+import os
+import re
+from typing import List
+
+ANALYSIS_DIR = os.path.dirname(os.path.abspath(__file__))
+NANOAOD_QUANTITIES = os.path.join(ANALYSIS_DIR, "quantities", "nanoAOD.py")
+# files in which branches are referenced by name, e.g. IDs, MET filters, HLT paths
+# and the replacement branches of SystematicShiftByQuantity
+CONFIG_FILES = [
+    os.path.join(ANALYSIS_DIR, filename)
+    for filename in ["config.py", "config_sumw.py", "triggersetup.py"]
+]
+BRANCH_NAME = re.compile(
+    r"^(HLT|Flag|L1PreFiringWeight|Muon|Electron|Tau|Jet|GenJet|GenPart|TrigObj|PuppiMET|MET)_[A-Za-z0-9_]+$"
+)
+
+# mean multiplicity (poisson), pt spectrum, eta acceptance and mass range per
+# collection, roughly matching a Drell-Yan / W+jets sample
+COLLECTIONS = {
+    "Muon": {"mean": 1.5, "pt_min": 3.0, "pt_slope": 20.0, "eta": 2.4, "mass": (0.1057, 0.1057)},
+    "Electron": {"mean": 1.2, "pt_min": 5.0, "pt_slope": 20.0, "eta": 2.5, "mass": (0.000511, 0.000511)},
+    "Tau": {"mean": 1.5, "pt_min": 18.0, "pt_slope": 25.0, "eta": 2.3, "mass": (0.2, 1.7)},
+    "Jet": {"mean": 6.0, "pt_min": 15.0, "pt_slope": 30.0, "eta": 4.7, "mass": (2.0, 20.0)},
+    "GenJet": {"mean": 7.0, "pt_min": 10.0, "pt_slope": 30.0, "eta": 5.0, "mass": (2.0, 20.0)},
+    "GenPart": {"mean": 40.0, "pt_min": 0.0, "pt_slope": 15.0, "eta": 5.0, "mass": (0.0, 5.0)},
+    "TrigObj": {"mean": 8.0, "pt_min": 5.0, "pt_slope": 25.0, "eta": 2.5, "mass": (0.0, 0.0)},
+}
+
+# (pattern on the part after the collection prefix, expression), the first match is used
+COLLECTION_RULES = [
+    (r"^pt$", "synthetic::SortedExponential({n}, {pt_min}, {pt_slope})"),
+    (r"^eta$", "synthetic::Uniform<float>({n}, -{eta}, {eta})"),
+    (r"^phi$", "synthetic::Uniform<float>({n}, -M_PI, M_PI)"),
+    (r"^mass$", "synthetic::Uniform<float>({n}, {mass[0]}, {mass[1]})"),
+    (r"^dxy$", "synthetic::Uniform<float>({n}, -0.05, 0.05)"),
+    (r"^dz$", "synthetic::Uniform<float>({n}, -0.2, 0.2)"),
+    (r"^pfRelIso", "synthetic::Exponential({n}, 0.0, 0.15)"),
+    (r"^charge$", "synthetic::Charge({n})"),
+    (r"^genPartFlav$", "synthetic::Choice<UChar_t>({n}, {{0, 1, 3, 4, 5, 15}})"),
+    (r"^(genPartIdx|genPartIdxMother)$", "synthetic::Index({n}, nGenPart)"),
+    (r"^genJetIdx$", "synthetic::Index({n}, nGenJet)"),
+    (r"^jetIdx$", "synthetic::Index({n}, nJet)"),
+    (r"^jetId$", "synthetic::Choice<int>({n}, {{0, 2, 6}})"),
+    (r"^puId$", "synthetic::Choice<int>({n}, {{0, 4, 6, 7}})"),
+    (r"^cutBased$", "synthetic::Integers<int>({n}, 0, 4)"),
+    (r"^pdgId$", "synthetic::Choice<int>({n}, {{1, -1, 2, -2, 5, -5, 11, -11, 13, -13, 15, -15, 21, 22, 23, 24, -24, 25}})"),
+    (r"^area$", "synthetic::Uniform<float>({n}, 0.4, 0.6)"),
+    (r"^rawFactor$", "synthetic::Uniform<float>({n}, 0.0, 0.2)"),
+    (r"(Id|_WP\d+)$", "synthetic::Flags({n}, 0.8)"),
+    (r"^decayMode$", "synthetic::Choice<int>({n}, {{0, 1, 10, 11}})"),
+    (r"^idDeepTau", "synthetic::Integers<UChar_t>({n}, 0, 255)"),
+    (r"^status$", "synthetic::Integers<int>({n}, 1, 100)"),
+    (r"^statusFlags$", "synthetic::Integers<int>({n}, 0, 32767)"),
+    (r"^filterBits$", "synthetic::Integers<int>({n}, 0, 65535)"),
+    (r"^id$", "synthetic::Choice<int>({n}, {{1, 11, 13, 15, 22}})"),
+]
+EVENT_RULES = [
+    (r"^run$", "static_cast<UInt_t>(1)"),
+    (r"^luminosityBlock$", "static_cast<UInt_t>(rdfentry_ / 1000 + 1)"),
+    (r"^event$", "static_cast<ULong64_t>(rdfentry_ + 1)"),
+    (r"^(HLT|Flag)_", "gRandom->Rndm() < {pass_probability}"),
+    (r"^L1PreFiringWeight_", "static_cast<float>(gRandom->Uniform(0.95, 1.0))"),
+    (r"^LHE_Njets$", "static_cast<UChar_t>(std::min<ULong64_t>(gRandom->Poisson(0.6), 4))"),
+    (r"^genWeight$", "gRandom->Rndm() < 0.15 ? -1.f : 1.f"),
+    (r"^Pileup_nTrueInt$", "static_cast<float>(std::max(gRandom->Gaus(32., 12.), 0.))"),
+    (r"^fixedGridRho", "static_cast<float>(std::max(gRandom->Gaus(20., 7.), 0.))"),
+    (r"MET_pt", "static_cast<float>(gRandom->Exp(30.))"),
+    (r"MET_sumEt", "static_cast<float>(std::max(gRandom->Gaus(1000., 300.), 0.))"),
+    (r"MET_phi", "static_cast<float>(gRandom->Uniform(-M_PI, M_PI))"),
+    (r"^MET_cov(XX|YY)$", "static_cast<float>(gRandom->Uniform(100., 1000.))"),
+    (r"^MET_covXY$", "static_cast<float>(gRandom->Uniform(-100., 100.))"),
+    (r"^MET_significance$", "static_cast<float>(gRandom->Exp(2.))"),
+    (r"^HTXS_Higgs_pt$", "static_cast<float>(gRandom->Exp(50.))"),
+    (r"^HTXS_Higgs_y$", "static_cast<float>(gRandom->Uniform(-2.5, 2.5))"),
+    (r"^HTXS_njets30$", "static_cast<UChar_t>(gRandom->Poisson(1.))"),
+    (r"^HTXS_stage", "static_cast<int>(gRandom->Integer(100))"),
+    (r"_is[A-Z]", "static_cast<bool>(gRandom->Integer(2))"),
+    (r"_n[A-Z]", "static_cast<int>(gRandom->Poisson(1.))"),
+]
+FALLBACK = "static_cast<float>(gRandom->Rndm())"
+
+SYNTHETIC_HELPERS = """
+namespace synthetic {
+template <typename T>
+ROOT::RVec<T> Uniform(unsigned int n, double low, double high) {
+    ROOT::RVec<T> values(n);
+    for (auto &value : values)
+        value = gRandom->Uniform(low, high);
+    return values;
+}
+ROOT::RVecF Exponential(unsigned int n, double offset, double slope) {
+    ROOT::RVecF values(n);
+    for (auto &value : values)
+        value = offset + gRandom->Exp(slope);
+    return values;
+}
+// nanoAOD collections are ordered by pt
+ROOT::RVecF SortedExponential(unsigned int n, double offset, double slope) {
+    auto values = Exponential(n, offset, slope);
+    std::sort(values.begin(), values.end(), std::greater<float>());
+    return values;
+}
+template <typename T>
+ROOT::RVec<T> Integers(unsigned int n, int low, int high) {
+    ROOT::RVec<T> values(n);
+    for (auto &value : values)
+        value = low + static_cast<int>(gRandom->Integer(high - low + 1));
+    return values;
+}
+template <typename T>
+ROOT::RVec<T> Choice(unsigned int n, const std::vector<T> &choices) {
+    ROOT::RVec<T> values(n);
+    for (auto &value : values)
+        value = choices[gRandom->Integer(choices.size())];
+    return values;
+}
+ROOT::RVecI Charge(unsigned int n) { return Choice<int>(n, {-1, 1}); }
+// index into another collection, -1 if there is no match
+ROOT::RVecI Index(unsigned int n, unsigned int target) {
+    return Integers<int>(n, -1, static_cast<int>(target) - 1);
+}
+ROOT::RVec<bool> Flags(unsigned int n, double probability) {
+    ROOT::RVec<bool> values(n);
+    for (std::size_t i = 0; i < n; ++i)
+        values[i] = gRandom->Rndm() < probability;
+    return values;
+}
+} // namespace synthetic
+"""
+
+
+def declared_branches(filename: str = NANOAOD_QUANTITIES) -> List[str]:
+    """Branch names of all NanoAODQuantity definitions in the given file."""
+    with open(filename) as f:
+        tree = ast.parse(f.read(), filename)
+    branches = []
+    for node in ast.walk(tree):
+        if (
+            isinstance(node, ast.Call)
+            and getattr(node.func, "id", None) == "NanoAODQuantity"
+            and node.args
+            and isinstance(node.args[0], ast.Constant)
+        ):
+            branches.append(node.args[0].value)
+    return branches
+
+
+def referenced_branches(filenames: List[str]) -> List[str]:
+    """String constants in the given files, that look like nanoAOD branch names."""
+    branches = []
+    for filename in filenames:
+        with open(filename) as f:
+            tree = ast.parse(f.read(), filename)
+        for node in ast.walk(tree):
+            if (
+                isinstance(node, ast.Constant)
+                and isinstance(node.value, str)
+                and BRANCH_NAME.match(node.value)
+            ):
+                branches.append(node.value)
+    return branches
+
+
+def consumed_branches(config_files: List[str] = CONFIG_FILES) -> List[str]:
+    return sorted(set(declared_branches()) | set(referenced_branches(config_files)))
+
+
+def branch_expression(branch: str, pass_probability: float) -> str:
+    collection, _, member = branch.partition("_")
+    if collection in COLLECTIONS and member:
+        for pattern, expression in COLLECTION_RULES:
+            if re.search(pattern, member):
+                return expression.format(n=f"n{collection}", **COLLECTIONS[collection])
+        logging.debug(f"No rule for {branch}, filling uniform values")
+        return f"synthetic::Uniform<float>(n{collection}, 0., 1.)"
+    for pattern, expression in EVENT_RULES:
+        if re.search(pattern, branch):
+            return expression.format(pass_probability=pass_probability)
+    logging.debug(f"No rule for {branch}, filling uniform values")
+    return FALLBACK
+
+
+def write_events(
+    output: str,
+    branches: List[str],
+    n_events: int,
+    seed: int,
+    pass_probability: float,
+    compression: int,
+) -> None:
+    """
+    Write n_events synthetic events with the given branches. The event loop has to
+    run single threaded, since all values are drawn from gRandom. The collections
+    are written as RVec branches next to their n<Collection> counter, RDataFrame
+    reads them the same way as the C-style arrays of the real nanoAOD.
+    """
+    import ROOT
+
+    if not hasattr(ROOT, "synthetic"):
+        ROOT.gInterpreter.Declare(SYNTHETIC_HELPERS)
+    ROOT.gRandom.SetSeed(seed)
+    df = ROOT.RDataFrame(n_events)
+    # all counters are defined, since index branches refer to other collections
+    for collection, settings in COLLECTIONS.items():
+        df = df.Define(
+            f"n{collection}",
+            f"static_cast<UInt_t>(gRandom->Poisson({settings['mean']}))",
+        )
+    columns = [
+        f"n{collection}"
+        for collection in COLLECTIONS
+        if any(branch.startswith(f"{collection}_") for branch in branches)
+    ]
+    for branch in branches:
+        df = df.Define(branch, branch_expression(branch, pass_probability))
+        columns.append(branch)
+    options = ROOT.RDF.RSnapshotOptions()
+    options.fCompressionAlgorithm = compression // 100
+    options.fCompressionLevel = compression % 100
+    df.Snapshot("Events", output, columns, options)
+
+
+def generate(
+    output: str,
+    branches: List[str],
+    n_events: int,
+    size_mb: float,
+    seed: int,
+    pass_probability: float,
+    compression: int,
+) -> int:
+    """
+    Generate the synthetic file. If a size is given, a first file with n_events
+    events is written to measure the size per event, and the file is rewritten
+    with the number of events needed to reach the requested size.
+    Returns the number of written events.
+    """
+    write_events(output, branches, n_events, seed, pass_probability, compression)
+    if size_mb:
+        bytes_per_event = os.path.getsize(output) / n_events
+        n_events = max(1, int(size_mb * 1024 * 1024 / bytes_per_event))
+        write_events(output, branches, n_events, seed, pass_probability, compression)
+    logging.info(
+        f"Wrote {n_events} events with {len(branches)} branches to {output} "
+        f"({os.path.getsize(output) / 1024 / 1024:.1f} MB)"
+    )
+    return n_events
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Generate a synthetic nanoAOD file with the branches consumed by this analysis."
+    )
+    parser.add_argument("--output", default="synthetic_nanoaod.root")
+    parser.add_argument(
+        "--events",
+        type=int,
+        default=10000,
+        help="number of events, or the number of events used to measure the size per event if --size-mb is given",
+    )
+    parser.add_argument("--size-mb", type=float, help="approximate size of the file")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--pass-probability",
+        type=float,
+        default=0.5,
+        help="probability of HLT paths and MET filters to be true",
+    )
+    parser.add_argument(
+        "--compression",
+        type=int,
+        default=209,
+        help="ROOT compression setting, nanoAOD is written with LZMA level 9",
+    )
+    parser.add_argument(
+        "--config",
+        nargs="+",
+        default=CONFIG_FILES,
+        help="files scanned for branches referenced by name",
+    )
+    parser.add_argument(
+        "--list", action="store_true", help="only print the consumed branches"
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level="INFO")
+
+    branches = consumed_branches(args.config)
+    if args.list:
+        print("\n".join(branches))
+        return
+    generate(
+        args.output,
+        branches,
+        args.events,
+        args.size_mb,
+        args.seed,
+        args.pass_probability,
+        args.compression,
+    )
+
+
+if __name__ == "__main__":
+    main()
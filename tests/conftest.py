@@ -0,0 +1,17 @@
+import importlib
+
+import pytest
+
+# the analysis is placed in analysis_configurations/earlyrun3 of the framework
+ANALYSIS = "analysis_configurations.earlyrun3"
+
+
+@pytest.fixture
+def analysis():
+    """Import modules of the analysis, the tests are skipped without the framework."""
+    pytest.importorskip("code_generation")
+
+    def load(name: str):
+        return importlib.import_module(f"{ANALYSIS}.{name}")
+
+    return load
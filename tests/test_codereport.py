@@ -0,0 +1,35 @@
+from argparse import Namespace
+
+import pytest
+
+REPORT = {
+    "calls": {"global": {"nominal": 40}, "mm": {"nominal": 50, "jesUncTotalUp": 10}},
+    "source_bytes": {"global": 2000, "mm": 3000, "common": 500},
+    "total_calls": 100,
+}
+
+
+def test_code_budget_from_command_line(analysis):
+    generate = analysis("generate")
+    codereport = analysis("codereport")
+    args = generate.analysis_arguments(
+        Namespace(), ["--call-budget", "99", "--source-budget", "6000"]
+    )
+    assert (args.call_budget, args.source_budget) == (99, 6000)
+    with pytest.raises(ValueError, match="100 producer calls"):
+        codereport.check_code_budget(REPORT, args.call_budget, args.source_budget)
+
+
+def test_source_budget_exceeded(analysis):
+    codereport = analysis("codereport")
+    with pytest.raises(ValueError, match="5500 bytes"):
+        codereport.check_code_budget(REPORT, 100, 5000)
+    codereport.check_code_budget(REPORT, 100, 5500)
+
+
+def test_no_budget_by_default(analysis):
+    generate = analysis("generate")
+    codereport = analysis("codereport")
+    args = generate.analysis_arguments(Namespace(), [])
+    assert args.call_budget is None and args.source_budget is None
+    codereport.check_code_budget(REPORT, args.call_budget, args.source_budget)
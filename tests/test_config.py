@@ -0,0 +1,38 @@
+import pytest
+
+# the available samples, eras and scopes of generate.run
+AVAILABLE = (
+    [
+        "ggh_htautau",
+        "ggh_hbb",
+        "vbf_htautau",
+        "vbf_hbb",
+        "rem_htautau",
+        "rem_hbb",
+        "embedding",
+        "embedding_mc",
+        "electroweak_boson",
+        "ttbar",
+        "diboson",
+        "dyjets",
+        "wjets",
+        "data",
+    ],
+    ["2016", "2017", "2018"],
+    ["mm", "mmet", "ee", "emet"],
+)
+
+
+@pytest.mark.parametrize("sample", ["dyjets", "data"])
+def test_config_validates(analysis, sample):
+    """build_config runs configuration.validate() and the indexed validation."""
+    config = analysis("config")
+    expanded = config.build_config("2018", sample, ["mm", "ee"], {"none"}, *AVAILABLE)
+    assert expanded
+
+
+def test_filter_follows_its_flags(analysis):
+    dependency_graph = analysis("dependency_graph")
+    pairselection = analysis("producers.pairselection")
+    leafs = dependency_graph.leaf_producers(pairselection.GoodLLPairFilter, "mm")
+    assert leafs[-1] is pairselection.GoodLLPairFilter
@@ -0,0 +1,52 @@
+from argparse import Namespace
+
+
+def test_shift_budget_from_command_line(analysis):
+    generate = analysis("generate")
+    jobsplitting = analysis("jobsplitting")
+    args = generate.analysis_arguments(Namespace(), ["--shift-budget", "200"])
+    assert args.shift_budget == 200
+    costs = {"a": 50, "b": 50, "c": 30, "d": 200}
+    groups = jobsplitting.partition_shifts(100, costs, args.shift_budget)
+    assert ["d"] in groups
+    assert sorted(shift for group in groups for shift in group) == ["a", "b", "c", "d"]
+    for group in groups:
+        if group != ["d"]:
+            assert sum(costs[shift] for shift in group) <= 100
+    assert len(groups) == 3
+
+
+def test_shift_budget_defaults_to_no_splitting(analysis):
+    generate = analysis("generate")
+    args = generate.analysis_arguments(Namespace(), [])
+    assert args.shift_budget is None
+
+
+def test_framework_arguments_take_precedence(analysis):
+    generate = analysis("generate")
+    args = generate.analysis_arguments(
+        Namespace(shift_budget=500), ["--shift-budget", "200"]
+    )
+    assert args.shift_budget == 500
+
+
+def test_share_executables_from_command_line(analysis):
+    generate = analysis("generate")
+    assert generate.analysis_arguments(Namespace(), []).share_executables is False
+    args = generate.analysis_arguments(Namespace(), ["--share-executables"])
+    assert args.share_executables is True
+
+
+def test_shared_executable_in_filelist(analysis, tmp_path):
+    generate = analysis("generate")
+    assert not generate.in_filelist(str(tmp_path), "config_dyjets_2018")
+    generate.add_to_filelist(str(tmp_path), "earlyrun3_config/config_dyjets_2018")
+    assert generate.in_filelist(str(tmp_path), "config_dyjets_2018")
+    assert not generate.in_filelist(str(tmp_path), "config_ttbar_2018")
+
+
+def test_split_scopes_from_command_line(analysis):
+    generate = analysis("generate")
+    assert generate.analysis_arguments(Namespace(), []).split_scopes is False
+    args = generate.analysis_arguments(Namespace(), ["--split-scopes"])
+    assert args.split_scopes is True
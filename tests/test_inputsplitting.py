@@ -0,0 +1,20 @@
+def test_partition_inputs(analysis):
+    inputsplitting = analysis("inputsplitting")
+    entries = {"a.root": 100, "b.root": 400, "c.root": 300, "d.root": 200, "e.root": 50}
+    jobs = inputsplitting.partition_inputs(entries, 2)
+    assert sorted(filename for job in jobs for filename in job) == sorted(entries)
+    loads = sorted(sum(entries[filename] for filename in job) for job in jobs)
+    assert loads == [500, 550]
+    # the largest files of a job are processed first
+    for job in jobs:
+        assert [entries[filename] for filename in job] == sorted(
+            (entries[filename] for filename in job), reverse=True
+        )
+
+
+def test_more_jobs_than_files(analysis):
+    inputsplitting = analysis("inputsplitting")
+    assert inputsplitting.partition_inputs({"a.root": 10, "b.root": 20}, 5) == [
+        ["b.root"],
+        ["a.root"],
+    ]
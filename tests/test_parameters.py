@@ -0,0 +1,44 @@
+from unittest import mock
+
+import pytest
+
+
+@pytest.fixture
+def modifiers():
+    return pytest.importorskip("code_generation.modifiers")
+
+
+def test_resolve_parameters(analysis, modifiers):
+    parameters = analysis("parameters")
+    block = {
+        "file": modifiers.EraModifier({"2017": "2017.root", "2018": "2018.root"}),
+        "flag": modifiers.SampleModifier({"data": False}, default=True),
+        "nested": [modifiers.EraModifier({"2017": 1, "2018": 2}), "plain"],
+    }
+    assert parameters.resolve_parameters(block, "2018", "dyjets") == {
+        "file": "2018.root",
+        "flag": True,
+        "nested": [2, "plain"],
+    }
+    assert parameters.resolve_parameters(block, "2017", "data") == {
+        "file": "2017.root",
+        "flag": False,
+        "nested": [1, "plain"],
+    }
+
+
+def test_modifiers_resolved_once_per_era_and_sample(analysis, modifiers):
+    parameters = analysis("parameters")
+    apply = modifiers.EraModifier.apply
+    with mock.patch.object(
+        modifiers.EraModifier, "apply", autospec=True, side_effect=apply
+    ) as applied:
+        # equal modifiers of separate build_config calls share the cached value
+        for _ in range(3):
+            value = modifiers.EraModifier({"2016": ["a"], "2018": ["b", "c"]})
+            resolved = parameters.resolve_parameters(value, "2016", "ttbar")
+            assert resolved == ["a"]
+            resolved.append("changed")
+        assert applied.call_count == 1
+        parameters.resolve_parameters(value, "2018", "ttbar")
+        assert applied.call_count == 2
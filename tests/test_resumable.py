@@ -0,0 +1,62 @@
+import json
+import os
+
+
+def test_shared_executable(analysis, tmp_path):
+    resumable = analysis("resumable")
+    samplemap = tmp_path / "config_2018_samplemap.json"
+    samplemap.write_text(
+        json.dumps(
+            {
+                "executables": {
+                    "config_dyjets_2018": "config_dyjets_2018",
+                    "config_wjets_2018": "config_dyjets_2018",
+                }
+            }
+        )
+    )
+    resolve = lambda executable: resumable.shared_executable(executable, str(samplemap))
+    assert resolve("bin/config_wjets_2018") == "bin/config_dyjets_2018"
+    assert resolve("bin/config_wjets_2018_1") == "bin/config_dyjets_2018_1"
+    assert resolve("bin/config_wjets_2018_mm_1") == "bin/config_dyjets_2018_mm_1"
+    assert resolve("bin/config_dyjets_2018") == "bin/config_dyjets_2018"
+    assert resolve("bin/config_ttbar_2018") == "bin/config_ttbar_2018"
+
+
+
+def test_chunk_key_changes_with_rebuilt_executable(analysis, tmp_path):
+    resumable = analysis("resumable")
+    executable = tmp_path / "config_dyjets_2018"
+    executable.write_bytes(b"first build")
+    first = resumable.executable_hash(str(executable))
+    key = resumable.chunk_key(str(executable), first, ["a.root"])
+    assert key == resumable.chunk_key(str(executable), first, ["a.root"])
+    assert key != resumable.chunk_key(str(executable), first, ["b.root"])
+    executable.write_bytes(b"second build")
+    second = resumable.executable_hash(str(executable))
+    assert second != first
+    assert key != resumable.chunk_key(str(executable), second, ["a.root"])
+
+
+def test_run_chunk_collects_metadata(analysis, tmp_path):
+    resumable = analysis("resumable")
+    executable = tmp_path / "config_dyjets_2018"
+    # writes the output given as first argument and the metadata record to the
+    # working directory, like the generated executables
+    executable.write_text(
+        "#!/bin/sh\n"
+        'echo "$2" > "$1"\n'
+        "echo '{}' > metadata.json\n"
+    )
+    executable.chmod(0o755)
+    (tmp_path / "a.root").write_text("input")
+    outdir = tmp_path / "out"
+    outdir.mkdir()
+    outputs = resumable.run_chunk(
+        str(executable), [str(tmp_path / "a.root")], str(outdir), "key"
+    )
+    assert sorted(os.path.basename(output) for output in outputs) == [
+        "key.root",
+        "key_metadata.json",
+    ]
+    assert sorted(os.listdir(outdir)) == ["key.root", "key_metadata.json"]
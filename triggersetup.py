@@ -1,133 +1,214 @@
+from typing import Dict, List
+
 from code_generation.modifiers import EraModifier, SampleModifier
 
+# trigger legs per scope group, every leg holds a list of trigger definitions per era
+MUON_TRIGGERS = {
+    "singlemoun_trigger_1": {
+        "2018": [
+            {
+                "flagname": "trg_single_mu24_1",
+                "hlt_path": "HLT_IsoMu24",
+                "ptcut": -1,
+                "etacut": 2.5,
+                "filterbit": -1,
+                "trigger_particle_id": 13,
+                "max_deltaR_triggermatch": 0.2,
+            },
+            {
+                "flagname": "trg_single_mu27_1",
+                "hlt_path": "HLT_IsoMu27",
+                "ptcut": -1,
+                "etacut": 2.5,
+                "filterbit": -1,
+                "trigger_particle_id": 13,
+                "max_deltaR_triggermatch": 0.2,
+            },
+        ],
+    },
+    "singlemoun_trigger_2": {
+        "2018": [
+            {
+                "flagname": "trg_single_mu24_2",
+                "hlt_path": "HLT_IsoMu24",
+                "ptcut": -1,
+                "etacut": 2.5,
+                "filterbit": -1,
+                "trigger_particle_id": 13,
+                "max_deltaR_triggermatch": 0.2,
+            },
+            {
+                "flagname": "trg_single_mu27_2",
+                "hlt_path": "HLT_IsoMu27",
+                "ptcut": -1,
+                "etacut": 2.5,
+                "filterbit": -1,
+                "trigger_particle_id": 13,
+                "max_deltaR_triggermatch": 0.2,
+            },
+        ],
+    },
+}
 
-def add_earlyRun3TriggerSetup(configuration):
-    ## mm, mmet scope trigger setup
+ELECTRON_TRIGGERS = {
+    "singleelectron_trigger_1": {
+        "2018": [
+            {
+                "flagname": "trg_single_ele27_1",
+                "hlt_path": "HLT_Ele27_WPTight_Gsf",
+                "ptcut": 27,
+                "etacut": 2.7,
+                "filterbit": 1,
+                "trigger_particle_id": 11,
+                "max_deltaR_triggermatch": 0.4,
+            },
+            {
+                "flagname": "trg_single_ele32_1",
+                "hlt_path": "HLT_Ele32_WPTight_Gsf",
+                "ptcut": 32,
+                "etacut": 2.7,
+                "filterbit": 1,
+                "trigger_particle_id": 11,
+                "max_deltaR_triggermatch": 0.4,
+            },
+            {
+                "flagname": "trg_single_ele35_1",
+                "hlt_path": "HLT_Ele35_WPTight_Gsf",
+                "ptcut": 35,
+                "etacut": 2.7,
+                "filterbit": 1,
+                "trigger_particle_id": 11,
+                "max_deltaR_triggermatch": 0.4,
+            },
+        ],
+    },
+    "singleelectron_trigger_2": {
+        "2018": [
+            {
+                "flagname": "trg_single_ele27_2",
+                "hlt_path": "HLT_Ele27_WPTight_Gsf",
+                "ptcut": 27,
+                "etacut": 2.7,
+                "filterbit": 1,
+                "trigger_particle_id": 11,
+                "max_deltaR_triggermatch": 0.4,
+            },
+            {
+                "flagname": "trg_single_ele32_2",
+                "hlt_path": "HLT_Ele32_WPTight_Gsf",
+                "ptcut": 32,
+                "etacut": 2.7,
+                "filterbit": 1,
+                "trigger_particle_id": 11,
+                "max_deltaR_triggermatch": 0.4,
+            },
+            {
+                "flagname": "trg_single_ele35_2",
+                "hlt_path": "HLT_Ele35_WPTight_Gsf",
+                "ptcut": 35,
+                "etacut": 2.7,
+                "filterbit": 1,
+                "trigger_particle_id": 11,
+                "max_deltaR_triggermatch": 0.4,
+            },
+        ],
+    },
+}
+
+# fields of a trigger definition making up its selection, in the order of the
+# arguments of trigger::MatchTriggerSelections
+SELECTION_FIELDS = [
+    "ptcut",
+    "etacut",
+    "trigger_particle_id",
+    "filterbit",
+    "max_deltaR_triggermatch",
+]
+
+
+def hlt_paths(triggers: Dict) -> List[str]:
+    """
+    Intern the HLT paths of all legs and eras of a scope group, in the order of
+    their first appearance. The paths are the inputs of triggers.TriggerDecisions,
+    every path is read once per event as a typed column, paths missing in the
+    input files of an era are set to false.
+    """
+    paths: List[str] = []
+    for leg in triggers.values():
+        for definitions in leg.values():
+            for trigger in definitions:
+                if trigger["hlt_path"] not in paths:
+                    paths.append(trigger["hlt_path"])
+    return paths
+
+
+MUON_HLT_PATHS = hlt_paths(MUON_TRIGGERS)
+ELECTRON_HLT_PATHS = hlt_paths(ELECTRON_TRIGGERS)
+
+
+def compile_triggers(legs: Dict[str, List[Dict]], paths: List[str]) -> Dict:
+    """
+    Compile the trigger definitions of all legs of a scope. Identical selections
+    (path and cuts) within a leg are evaluated once. Returns the parameters of the
+    trigger producers: the selections of every leg as parallel lists, the path
+    given by its index in the interned paths, and the trigger definitions of every
+    leg with the index of their selection added.
+    """
+    compiled = {}
+    for leg, triggers in legs.items():
+        selections: List[tuple] = []
+        definitions = []
+        for trigger in triggers:
+            selection = (paths.index(trigger["hlt_path"]),) + tuple(
+                trigger[field] for field in SELECTION_FIELDS
+            )
+            if selection not in selections:
+                selections.append(selection)
+            definitions.append(
+                dict(trigger, selection_index=selections.index(selection))
+            )
+        compiled[leg] = definitions
+        for index, field in enumerate(["path_index"] + SELECTION_FIELDS):
+            compiled[f"{leg}_{field}"] = ", ".join(
+                str(selection[index]) for selection in selections
+            )
+    return compiled
+
+
+def add_compiled_triggers(
+    configuration, scopes: List[str], triggers: Dict, paths: List[str]
+) -> None:
+    eras = sorted({era for leg in triggers.values() for era in leg})
+    compiled = {
+        era: compile_triggers(
+            {
+                leg: definitions[era]
+                for leg, definitions in triggers.items()
+                if era in definitions
+            },
+            paths,
+        )
+        for era in eras
+    }
+    parameters = sorted({name for era in eras for name in compiled[era]})
     configuration.add_config_parameters(
-        ["mm", "mmet"],
+        scopes,
         {
-            "singlemoun_trigger_1": EraModifier(
-                {
-                    "2018": [
-                        {
-                            "flagname": "trg_single_mu24_1",
-                            "hlt_path": "HLT_IsoMu24",
-                            "ptcut": -1,
-                            "etacut": 2.5,
-                            "filterbit": -1,
-                            "trigger_particle_id": 13,
-                            "max_deltaR_triggermatch": 0.2,
-                        },
-                        {
-                            "flagname": "trg_single_mu27_1",
-                            "hlt_path": "HLT_IsoMu27",
-                            "ptcut": -1,
-                            "etacut": 2.5,
-                            "filterbit":-1,
-                            "trigger_particle_id": 13,
-                            "max_deltaR_triggermatch": 0.2,
-                        },
-                    ],
-                }
-            ),
-            "singlemoun_trigger_2": EraModifier(
-                {
-                    "2018": [
-                        {
-                            "flagname": "trg_single_mu24_2",
-                            "hlt_path": "HLT_IsoMu24",
-                            "ptcut": -1,
-                            "etacut": 2.5,
-                            "filterbit": -1,
-                            "trigger_particle_id": 13,
-                            "max_deltaR_triggermatch": 0.2,
-                        },
-                        {
-                            "flagname": "trg_single_mu27_2",
-                            "hlt_path": "HLT_IsoMu27",
-                            "ptcut": -1,
-                            "etacut": 2.5,
-                            "filterbit": -1,
-                            "trigger_particle_id": 13,
-                            "max_deltaR_triggermatch": 0.2,
-                        },
-                    ],
-                }
-            ),
+            name: EraModifier(
+                {era: compiled[era][name] for era in eras if name in compiled[era]}
+            )
+            for name in parameters
         },
     )
 
+
+def add_earlyRun3TriggerSetup(configuration):
+    ## mm, mmet scope trigger setup
+    add_compiled_triggers(configuration, ["mm", "mmet"], MUON_TRIGGERS, MUON_HLT_PATHS)
+
     ## ee, emet scope trigger setup
-    configuration.add_config_parameters(
-        ["ee", "emet"],
-        {
-            "singleelectron_trigger_1": EraModifier(
-                {
-                    "2018": [
-                        {
-                            "flagname": "trg_single_ele27_1",
-                            "hlt_path": "HLT_Ele27_WPTight_Gsf",
-                            "ptcut": 27,
-                            "etacut": 2.7,
-                            "filterbit": 1,
-                            "trigger_particle_id": 11,
-                            "max_deltaR_triggermatch": 0.4,
-                        },
-                        {
-                            "flagname": "trg_single_ele32_1",
-                            "hlt_path": "HLT_Ele32_WPTight_Gsf",
-                            "ptcut": 32,
-                            "etacut": 2.7,
-                            "filterbit": 1,
-                            "trigger_particle_id": 11,
-                            "max_deltaR_triggermatch": 0.4,
-                        },
-                        {
-                            "flagname": "trg_single_ele35_1",
-                            "hlt_path": "HLT_Ele35_WPTight_Gsf",
-                            "ptcut": 35,
-                            "etacut": 2.7,
-                            "filterbit": 1,
-                            "trigger_particle_id": 11,
-                            "max_deltaR_triggermatch": 0.4,
-                        },
-                    ],
-                }
-            ),
-            "singleelectron_trigger_2": EraModifier(
-                {
-                    "2018": [
-                        {
-                            "flagname": "trg_single_ele27_2",
-                            "hlt_path": "HLT_Ele27_WPTight_Gsf",
-                            "ptcut": 27,
-                            "etacut": 2.7,
-                            "filterbit": 1,
-                            "trigger_particle_id": 11,
-                            "max_deltaR_triggermatch": 0.4,
-                        },
-                        {
-                            "flagname": "trg_single_ele32_2",
-                            "hlt_path": "HLT_Ele32_WPTight_Gsf",
-                            "ptcut": 32,
-                            "etacut": 2.7,
-                            "filterbit": 1,
-                            "trigger_particle_id": 11,
-                            "max_deltaR_triggermatch": 0.4,
-                        },
-                        {
-                            "flagname": "trg_single_ele35_2",
-                            "hlt_path": "HLT_Ele35_WPTight_Gsf",
-                            "ptcut": 35,
-                            "etacut": 2.7,
-                            "filterbit": 1,
-                            "trigger_particle_id": 11,
-                            "max_deltaR_triggermatch": 0.4,
-                        },
-                    ],
-                }
-            ),
-        },
+    add_compiled_triggers(
+        configuration, ["ee", "emet"], ELECTRON_TRIGGERS, ELECTRON_HLT_PATHS
     )
 
     return configuration